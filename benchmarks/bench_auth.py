@@ -0,0 +1,85 @@
+"""
+Micro-benchmark: per-request API key authentication overhead.
+
+Measures main.authenticate_api_key and the permission check against the
+previous approach (raw-key dict lookup, a new AuthInfo model and an INFO log
+line per request), plus the full hot-path cost paid by /mcp/stream: header
+parsing, key lookup and the per-method permission check.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_auth [--number 100000]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MCP_API_KEYS", "bench-key-0123456789abcdef:Bench Client:tools,resources")
+
+from pydantic import BaseModel
+
+import main as server
+
+API_KEY = os.environ["MCP_API_KEYS"].split(":", 1)[0]
+
+
+class LegacyAuthInfo(BaseModel):
+    key: str
+    client_name: str
+    permissions: list[str]
+
+
+def legacy_authenticate(api_key: str) -> LegacyAuthInfo:
+    """The per-request work authenticate_request used to do."""
+    if api_key not in server.key_store.keys:
+        raise ValueError("Invalid API key")
+    client_info = server.key_store.keys[api_key]
+    server.logger.info(f"Authenticated client: {client_info['name']}")
+    return LegacyAuthInfo(key=api_key, client_name=client_info["name"], permissions=client_info["permissions"])
+
+
+def measure(fn, number: int) -> float:
+    """Best-of-5 time per call, in nanoseconds."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=100000, help="iterations per function measurement")
+    args = parser.parse_args()
+
+    # Production log level: the legacy path still formats its INFO message
+    logging.getLogger().setLevel(logging.WARNING)
+    server.logger.setLevel(logging.INFO)
+    null_handler = logging.NullHandler()
+    server.logger.handlers = [null_handler]
+    server.logger.propagate = False
+
+    legacy = measure(lambda: legacy_authenticate(API_KEY), args.number)
+    current = measure(lambda: server.authenticate_api_key(API_KEY), args.number)
+    auth = server.authenticate_api_key(API_KEY)
+    legacy_auth = legacy_authenticate(API_KEY)
+    legacy_check = measure(lambda: "resources" in legacy_auth.permissions, args.number)
+    current_check = measure(lambda: "resources" in auth.permissions, args.number)
+
+    print("Function-level cost per request")
+    print(f"  legacy authenticate (dict + new model + log line)    {legacy:>7.0f} ns")
+    print(f"  authenticate_api_key (hash index, shared principal)  {current:>7.0f} ns   {legacy / current:.1f}x")
+    print(f"  permission check, list scan                          {legacy_check:>7.0f} ns")
+    print(f"  permission check, frozenset                          {current_check:>7.0f} ns")
+
+    header = f"Bearer {API_KEY}"
+
+    def hot_path():
+        principal = server.authenticate_api_key(server.parse_authorization(header))
+        return "tools" in principal.permissions
+
+    total = measure(hot_path, args.number)
+    print(f"\nPer-request auth on /mcp/stream (parse header + lookup + permission): {total:.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
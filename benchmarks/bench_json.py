@@ -0,0 +1,89 @@
+"""
+Micro-benchmark: JSON encode/decode cost for MCP responses and NWS payloads.
+
+Compares the stdlib json module with every fast backend that is installed
+(orjson, msgspec) on realistically sized alert feeds, and shows the end-to-end
+difference between FastAPI's default response path (jsonable_encoder + stdlib
+json) and main.FastJSONResponse.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_json [--alerts 150] [--number 200]
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import make_alerts_payload, make_forecast_payload
+
+
+def backends():
+    """Yield (name, dumps, loads) for each available JSON backend."""
+    yield "json", lambda v: json.dumps(v, separators=(",", ":"), ensure_ascii=False).encode("utf-8"), json.loads
+    try:
+        import orjson
+        yield "orjson", orjson.dumps, orjson.loads
+    except ImportError:
+        print("(orjson not installed - skipping)")
+    try:
+        import msgspec
+        yield "msgspec", msgspec.json.Encoder().encode, msgspec.json.Decoder().decode
+    except ImportError:
+        print("(msgspec not installed - skipping)")
+
+
+def measure(fn, number: int) -> float:
+    """Best-of-5 time per call, in microseconds."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def report(title: str, rows: list[tuple[str, float]]):
+    print(f"\n{title}")
+    baseline = rows[0][1]
+    for name, micros in rows:
+        print(f"  {name:<28} {micros:>10.1f} µs   {baseline / micros:>5.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alerts", type=int, default=150, help="alerts in the feed (default: 150)")
+    parser.add_argument("--number", type=int, default=200, help="iterations per measurement (default: 200)")
+    args = parser.parse_args()
+
+    alerts = make_alerts_payload(args.alerts)
+    forecast = make_forecast_payload()
+    alerts_body = json.dumps(alerts).encode("utf-8")
+    forecast_body = json.dumps(forecast).encode("utf-8")
+    # A get_alerts tool result as returned through /tools/call and /mcp/stream
+    tool_result = {"jsonrpc": "2.0", "id": 1, "result": {"content": [
+        {"type": "text", "text": "\n---\n".join(f["properties"]["description"] for f in alerts["features"])}
+    ]}}
+    print(f"Alerts feed: {args.alerts} alerts, {len(alerts_body) / 1024:.0f} KiB; "
+          f"forecast: {len(forecast_body) / 1024:.1f} KiB; tool result: {len(json.dumps(tool_result)) / 1024:.0f} KiB")
+
+    available = list(backends())
+    report("Decode NWS alerts feed", [(name, measure(lambda: loads(alerts_body), args.number)) for name, _, loads in available])
+    report("Decode NWS forecast", [(name, measure(lambda: loads(forecast_body), args.number * 10)) for name, _, loads in available])
+    report("Encode get_alerts tool result", [(name, measure(lambda: dumps(tool_result), args.number)) for name, dumps, _ in available])
+    report("Encode raw alerts feed", [(name, measure(lambda: dumps(alerts), args.number)) for name, dumps, _ in available])
+
+    # End-to-end response rendering as FastAPI does it
+    try:
+        from fastapi.encoders import jsonable_encoder
+        from fastapi.responses import JSONResponse
+        import main as server
+    except ImportError as e:
+        print(f"\n(skipping response class comparison: {e})")
+        return
+    report(f"Render /tools/call response (main.JSON_BACKEND={server.JSON_BACKEND})", [
+        ("jsonable_encoder+JSONResponse", measure(lambda: JSONResponse(jsonable_encoder(tool_result)), args.number)),
+        ("FastJSONResponse", measure(lambda: server.FastJSONResponse(tool_result), args.number)),
+    ])
+
+
+if __name__ == "__main__":
+    main()
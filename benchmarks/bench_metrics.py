@@ -0,0 +1,98 @@
+"""
+Micro-benchmark: cost of recording Prometheus metrics on the request path.
+
+Measures the individual recording primitives (histogram observe, counter
+increment, in-flight gauge update) and the end-to-end overhead they add to a
+JSON-RPC dispatch, by running the same ping and cached tools/call messages
+through main.MCPServer.dispatch with metrics enabled and disabled. Also times
+a /metrics scrape with many series.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_metrics [--number 100000]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MCP_API_KEYS", "bench-key-0123456789abcdef:Bench Client:tools,resources")
+
+import main as server
+from benchmarks.fixtures import make_alerts_payload
+
+API_KEY = os.environ["MCP_API_KEYS"].split(":", 1)[0]
+
+
+def measure(fn, number: int) -> float:
+    """Best-of-5 time per call, in nanoseconds."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e9
+
+
+def measure_async(make_call, number: int) -> float:
+    """Best-of-5 time per awaited call, in nanoseconds."""
+    async def run() -> float:
+        best = float("inf")
+        for _ in range(5):
+            started = time.perf_counter()
+            for _ in range(number):
+                await make_call()
+            best = min(best, time.perf_counter() - started)
+        return best / number * 1e9
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=100000, help="iterations per measurement")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    registry = server.MetricsRegistry(server.METRICS_LATENCY_BUCKETS)
+    registry.histogram("bench_seconds", "bench")
+    registry.counter("bench_total", "bench")
+    registry.gauge("bench_in_flight", "bench")
+    labels = (("method", "tools/call"), ("outcome", "ok"))
+
+    observe = measure(lambda: registry.observe("bench_seconds", labels, 0.042), args.number)
+    inc = measure(lambda: registry.inc("bench_total", labels), args.number)
+    track = measure(lambda: registry.track("bench_in_flight", labels, 1), args.number)
+    print("Recording primitives")
+    print(f"  histogram observe        {observe:>6.0f} ns")
+    print(f"  counter increment        {inc:>6.0f} ns")
+    print(f"  in-flight gauge update   {track:>6.0f} ns")
+
+    # Serve tool calls from a warm cache so the measurement is dominated by dispatch, not I/O
+    auth = server.authenticate_api_key(API_KEY)
+    alerts_url = f"{server.NWS_API_BASE}/alerts/active/area/CA"
+    server.nws_client.cache.set(alerts_url, make_alerts_payload(20, "CA"), ttl=3600, stale_ttl=0)
+    ping = {"jsonrpc": "2.0", "id": 1, "method": "ping"}
+    tool_call = {
+        "jsonrpc": "2.0",
+        "id": 2,
+        "method": "tools/call",
+        "params": {"name": "get_alerts", "arguments": {"state": "CA"}}
+    }
+    number = max(1, args.number // 10)
+
+    print("\nPer-request overhead on MCPServer.dispatch")
+    for name, message in (("ping", ping), ("tools/call get_alerts (cached)", tool_call)):
+        server.metrics.enabled = False
+        disabled = measure_async(lambda: server.mcp_server.dispatch(message, auth), number)
+        server.metrics.enabled = True
+        enabled = measure_async(lambda: server.mcp_server.dispatch(message, auth), number)
+        print(f"  {name:<32} off {disabled / 1000:>7.2f} us   on {enabled / 1000:>7.2f} us   overhead {enabled - disabled:>6.0f} ns")
+
+    for method in range(20):
+        for client in range(10):
+            registry.observe("bench_seconds", (("method", f"m{method}"), ("client", f"c{client}")), 0.01)
+    scrape = measure(registry.render, 200) / 1000
+    print(f"\n/metrics render with 200 histogram series: {scrape:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
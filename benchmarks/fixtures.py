@@ -0,0 +1,147 @@
+"""
+Realistically sized NWS API payloads for benchmarks.
+
+The shapes and field lengths mirror real api.weather.gov responses (a busy
+state's /alerts/active/area feed, a /points lookup and a gridpoint
+/forecast), so encode/decode and formatting costs are representative without
+calling the live API.
+"""
+
+import random
+
+DESCRIPTION = (
+    "* WHAT...Flooding caused by excessive rainfall continues. Widespread "
+    "flooding of low-lying areas, urban streets and small streams is ongoing. "
+    "* WHERE...Portions of the area, including the metro and surrounding "
+    "counties. * WHEN...Until further notice. * IMPACTS...Flooding of rivers, "
+    "creeks, streams, and other low-lying and flood-prone locations is "
+    "imminent or occurring. Numerous roads are closed and some evacuations "
+    "are ongoing. * ADDITIONAL DETAILS... - At 1200 PM CDT, Doppler radar and "
+    "automated rain gauges indicated heavy rain due to thunderstorms. "
+    "Between 3 and 6 inches of rain have fallen. Additional rainfall "
+    "amounts of 1 to 2 inches are possible in the warned area. "
+)
+INSTRUCTION = (
+    "Turn around, don't drown when encountering flooded roads. Most flood "
+    "deaths occur in vehicles. Move to higher ground now. Act quickly to "
+    "protect your life. Be especially cautious at night when it is harder "
+    "to recognize the dangers of flooding."
+)
+EVENTS = ["Flood Warning", "Flash Flood Warning", "Heat Advisory", "Severe Thunderstorm Watch",
+          "Wind Advisory", "Red Flag Warning", "Tornado Warning", "Winter Storm Warning"]
+SEVERITIES = ["Minor", "Moderate", "Severe", "Extreme"]
+
+
+def make_alert(index: int, state: str = "TX", rng: random.Random | None = None) -> dict:
+    """One alert feature shaped like an NWS /alerts GeoJSON feature."""
+    rng = rng or random.Random(index)
+    alert_id = f"urn:oid:2.49.0.1.840.0.{index:040x}.001.1"
+    polygon = [[round(-97.0 + rng.random(), 4), round(30.0 + rng.random(), 4)] for _ in range(24)]
+    polygon.append(polygon[0])
+    zones = [f"{state}Z{rng.randint(1, 260):03d}" for _ in range(rng.randint(3, 12))]
+    return {
+        "id": f"https://api.weather.gov/alerts/{alert_id}",
+        "type": "Feature",
+        "geometry": {"type": "Polygon", "coordinates": [polygon]},
+        "properties": {
+            "@id": f"https://api.weather.gov/alerts/{alert_id}",
+            "@type": "wx:Alert",
+            "id": alert_id,
+            "areaDesc": "; ".join(f"County {z}" for z in zones),
+            "geocode": {"SAME": [f"048{rng.randint(1, 500):03d}" for _ in zones], "UGC": zones},
+            "affectedZones": [f"https://api.weather.gov/zones/county/{z}" for z in zones],
+            "references": [],
+            "sent": "2026-10-16T12:00:00-05:00",
+            "effective": "2026-10-16T12:00:00-05:00",
+            "onset": "2026-10-16T12:00:00-05:00",
+            "expires": "2026-10-16T18:00:00-05:00",
+            "ends": "2026-10-17T06:00:00-05:00",
+            "status": "Actual",
+            "messageType": "Alert",
+            "category": "Met",
+            "severity": rng.choice(SEVERITIES),
+            "certainty": "Likely",
+            "urgency": "Immediate",
+            "event": rng.choice(EVENTS),
+            "sender": "w-nws.webmaster@noaa.gov",
+            "senderName": "NWS Fort Worth TX",
+            "headline": "Flood Warning issued October 16 at 12:00PM CDT until October 17 at 6:00AM CDT by NWS Fort Worth TX",
+            "description": DESCRIPTION * rng.randint(1, 3),
+            "instruction": INSTRUCTION,
+            "response": "Avoid",
+            "parameters": {
+                "AWIPSidentifier": ["FLWFWD"],
+                "WMOidentifier": ["WGUS44 KFWD 161700"],
+                "NWSheadline": ["FLOOD WARNING REMAINS IN EFFECT"],
+                "BLOCKCHANNEL": ["EAS", "NWEM", "CMAS"],
+            },
+        },
+    }
+
+
+def make_alerts_payload(count: int = 150, state: str = "TX", seed: int = 0) -> dict:
+    """An /alerts/active/area/{state} feed with `count` alerts."""
+    rng = random.Random(seed)
+    return {
+        "@context": ["https://geojson.org/geojson-ld/geojson-context.jsonld", {"@version": "1.1"}],
+        "type": "FeatureCollection",
+        "features": [make_alert(i, state, rng) for i in range(count)],
+        "title": f"Current watches, warnings, and advisories for {state}",
+        "updated": "2026-10-16T12:00:00+00:00",
+    }
+
+
+def make_points_payload(latitude: float, longitude: float, base_url: str = "https://api.weather.gov") -> dict:
+    """A /points/{lat},{lon} response pointing at a gridpoint forecast."""
+    grid_x = int(abs(latitude) * 10) % 200
+    grid_y = int(abs(longitude) * 10) % 200
+    return {
+        "id": f"{base_url}/points/{latitude},{longitude}",
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [longitude, latitude]},
+        "properties": {
+            "gridId": "FWD",
+            "gridX": grid_x,
+            "gridY": grid_y,
+            "forecast": f"{base_url}/gridpoints/FWD/{grid_x},{grid_y}/forecast",
+            "forecastHourly": f"{base_url}/gridpoints/FWD/{grid_x},{grid_y}/forecast/hourly",
+            "forecastGridData": f"{base_url}/gridpoints/FWD/{grid_x},{grid_y}",
+            "timeZone": "America/Chicago",
+            "radarStation": "KFWS",
+        },
+    }
+
+
+def make_forecast_payload(periods: int = 14) -> dict:
+    """A gridpoint /forecast response with `periods` forecast periods."""
+    names = ["Today", "Tonight", "Friday", "Friday Night", "Saturday", "Saturday Night", "Sunday",
+             "Sunday Night", "Monday", "Monday Night", "Tuesday", "Tuesday Night", "Wednesday", "Wednesday Night"]
+    return {
+        "type": "Feature",
+        "properties": {
+            "units": "us",
+            "generatedAt": "2026-10-16T12:00:00+00:00",
+            "updated": "2026-10-16T11:30:00+00:00",
+            "periods": [
+                {
+                    "number": i + 1,
+                    "name": names[i % len(names)],
+                    "startTime": "2026-10-16T12:00:00-05:00",
+                    "endTime": "2026-10-16T18:00:00-05:00",
+                    "isDaytime": i % 2 == 0,
+                    "temperature": 70 + (i % 7),
+                    "temperatureUnit": "F",
+                    "probabilityOfPrecipitation": {"unitCode": "wmoUnit:percent", "value": 20},
+                    "windSpeed": "10 to 15 mph",
+                    "windDirection": "S",
+                    "shortForecast": "Chance Showers And Thunderstorms",
+                    "detailedForecast": (
+                        "A chance of showers and thunderstorms after 1pm. Mostly sunny, "
+                        "with a high near 75. South wind 10 to 15 mph, with gusts as high "
+                        "as 25 mph. Chance of precipitation is 20%."
+                    ),
+                }
+                for i in range(periods)
+            ],
+        },
+    }
@@ -0,0 +1,310 @@
+"""
+Offline load test: main.py's app against the local NWS stub.
+
+Starts benchmarks.nws_stub and the MCP server (uvicorn, NWS_API_BASE pointed
+at the stub) as subprocesses on free local ports, then drives each scenario
+at fixed concurrency levels and reports requests/s, p50/p95/p99 latency,
+errors and upstream NWS calls per request (from the stub's counters).
+
+Scenarios:
+    alerts    POST /tools/call get_alerts over a rotating set of states
+    forecast  POST /tools/call get_forecast over a rotating set of coordinates
+    mcp       POST /mcp/stream JSON-RPC tools/call mixing both tools
+
+Modes:
+    warm      a small rotating key set (10 states, 20 points) that the warmup
+              fills, so measured requests exercise the cached path
+    cold      every request uses a key no earlier request used (alert zones,
+              distinct gridpoints), so each one goes upstream and the stub's
+              latency, jitter and error rate show up in the results
+
+Upstream calls made during warmup are reported separately.
+
+Results can be saved with --save and compared against a saved run with
+--baseline; a drop in req/s or a rise in p95 beyond --threshold percent is
+flagged, and --fail-on-regression turns that into a non-zero exit code.
+
+Usage (from the repository root):
+    python -m benchmarks.load_test [--concurrency 1,10,50] [--requests 500]
+    python -m benchmarks.load_test --save baseline.json
+    python -m benchmarks.load_test --baseline baseline.json --fail-on-regression
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from itertools import count
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_KEY = "load-test-key-0123456789abcdef"
+
+STATES = ["TX", "CA", "FL", "NY", "LA", "OK", "KS", "CO", "WA", "IL"]
+COORDINATES = [
+    (32.7767, -96.797), (29.7604, -95.3698), (30.2672, -97.7431), (35.4676, -97.5164), (39.7392, -104.9903),
+    (47.6062, -122.3321), (41.8781, -87.6298), (25.7617, -80.1918), (40.7128, -74.006), (34.0522, -118.2437),
+    (37.7749, -122.4194), (33.4484, -112.074), (36.1627, -86.7816), (29.9511, -90.0715), (39.0997, -94.5786),
+    (44.9778, -93.265), (38.627, -90.1994), (35.2271, -80.8431), (42.3601, -71.0589), (45.5152, -122.6784),
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), round(pct / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[rank - 1]
+
+
+def wait_until_ready(url: str, timeout: float = 30.0, headers: dict | None = None):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, headers=headers, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready within {timeout:g}s")
+
+
+def start_processes(args) -> tuple[list[subprocess.Popen], str, str]:
+    """Start the NWS stub and the MCP server; returns (processes, server_url, stub_url)."""
+    stub_port, server_port = free_port(), free_port()
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    server_url = f"http://127.0.0.1:{server_port}"
+    log = open(args.log, "w") if args.log else subprocess.DEVNULL
+    stub = subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.nws_stub", "--port", str(stub_port),
+            "--latency", str(args.latency), "--jitter", str(args.jitter), "--error-rate", str(args.error_rate),
+            "--alerts", str(args.alerts), "--max-age", str(args.max_age)
+        ],
+        cwd=ROOT, stdout=log, stderr=log
+    )
+    env = {
+        **os.environ,
+        "NWS_API_BASE": stub_url,
+        "MCP_API_KEYS": f"{API_KEY}:Load Test:tools,resources",
+        "MCP_RATE_LIMIT_RATE": "0",
+        "MCP_RATE_LIMIT_MAX_IN_FLIGHT": "0",
+        # Every run starts cold rather than from the previous run's cache snapshot
+        "CACHE_SNAPSHOT_PATH": "",
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(server_port),
+            "--log-level", "warning", "--no-access-log"
+        ],
+        cwd=ROOT, env=env, stdout=log, stderr=log
+    )
+    processes = [stub, server]
+    try:
+        wait_until_ready(f"{stub_url}/__stats")
+        wait_until_ready(f"{server_url}/health")
+    except Exception:
+        stop_processes(processes)
+        raise
+    return processes, server_url, stub_url
+
+
+def stop_processes(processes: list[subprocess.Popen]):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def cold_coordinates(n: int) -> tuple[float, float]:
+    """The n-th of 40000 points that each map to a different stub gridpoint."""
+    return round(20.05 + (n % 200) / 10, 4), round(-80.05 - (n // 200 % 200) / 10, 4)
+
+
+def make_request(scenario: str, n: int, cold: bool = False) -> tuple[str, dict]:
+    """Path and JSON body of the n-th request of a scenario."""
+    if scenario == "mcp":
+        _, body = make_request("alerts" if n % 2 else "forecast", n // 2 if not cold else n, cold)
+        return "/mcp/stream", {"jsonrpc": "2.0", "id": n, "method": "tools/call", "params": body["params"]}
+    if scenario == "alerts":
+        if cold:
+            arguments = {"zones": [f"{STATES[n % len(STATES)]}Z{n // len(STATES) % 1000:03d}"]}
+        else:
+            arguments = {"state": STATES[n % len(STATES)]}
+        name = "get_alerts"
+    else:
+        latitude, longitude = cold_coordinates(n) if cold else COORDINATES[n % len(COORDINATES)]
+        arguments = {"latitude": latitude, "longitude": longitude}
+        name = "get_forecast"
+    return "/tools/call", {"method": "tools/call", "params": {"name": name, "arguments": arguments}}
+
+
+async def run_level(
+    server_url: str,
+    stub_url: str,
+    scenario: str,
+    concurrency: int,
+    total: int,
+    mode: str = "warm",
+    offset: int = 0
+) -> dict:
+    """Send `total` requests with `concurrency` workers and summarize latency and upstream usage.
+
+    In cold mode request n uses key offset + n, so callers pass a running
+    offset to keep keys unique across levels.
+    """
+    headers = {"Authorization": f"Bearer {API_KEY}"}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=server_url, headers=headers, limits=limits, timeout=60.0) as client:
+        await client.post(f"{stub_url}/__reset")
+        sequence = count()
+        latencies: list[float] = []
+        errors = 0
+
+        async def worker():
+            nonlocal errors
+            while (n := next(sequence)) < total:
+                path, body = make_request(scenario, offset + n, cold=mode == "cold")
+                started = time.perf_counter()
+                try:
+                    response = await client.post(path, json=body)
+                    failed = response.status_code != 200 or (scenario == "mcp" and "error" in response.json())
+                except httpx.HTTPError:
+                    failed = True
+                latencies.append(time.perf_counter() - started)
+                errors += failed
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        upstream = (await client.get(f"{stub_url}/__stats")).json()
+
+    latencies.sort()
+    return {
+        "scenario": scenario,
+        "mode": mode,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "upstream": upstream.get("requests", 0),
+        "upstream_per_request": round(upstream.get("requests", 0) / total, 3),
+    }
+
+
+def run_key(r: dict) -> str:
+    return f"{r['scenario']}/{r.get('mode', 'warm')}@{r['concurrency']}"
+
+
+def print_results(results: list[dict], warmups: list[dict]):
+    for w in warmups:
+        print(f"warmup {w['scenario']}/{w['mode']}: {w['requests']} requests, {w['upstream']} upstream calls, {w['errors']} errors")
+    print(f"{'scenario':<10} {'mode':<5} {'conc':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} {'upstream/req':>13}")
+    for r in results:
+        print(
+            f"{r['scenario']:<10} {r['mode']:<5} {r['concurrency']:>5} {r['rps']:>9.1f} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+            f"{r['p99_ms']:>9.2f} {r['errors']:>7} {r['upstream_per_request']:>13.3f}"
+        )
+
+
+def compare(results: list[dict], baseline: dict, threshold: float) -> bool:
+    """Print the change against a saved run; returns True if anything regressed beyond threshold percent."""
+    previous = {run_key(r): r for r in baseline.get("results", [])}
+    regressed = False
+    print(f"\nAgainst baseline ({baseline.get('meta', {}).get('created', 'unknown date')}), threshold {threshold:g}%")
+    print(f"{'run':<22} {'req/s':>18} {'p95 ms':>20} {'upstream/req':>16}")
+    for r in results:
+        key = run_key(r)
+        old = previous.get(key)
+        if old is None:
+            print(f"{key:<22} (not in baseline)")
+            continue
+        rps_change = (r["rps"] - old["rps"]) / old["rps"] * 100 if old["rps"] else 0.0
+        p95_change = (r["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0.0
+        flag = ""
+        if rps_change < -threshold or p95_change > threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(
+            f"{key:<22} {old['rps']:>8.1f} {rps_change:>+8.1f}% {old['p95_ms']:>10.2f} {p95_change:>+8.1f}% "
+            f"{old['upstream_per_request']:>7.3f} -> {r['upstream_per_request']:<7.3f}{flag}"
+        )
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default="alerts,forecast,mcp", help="comma-separated scenarios to run")
+    parser.add_argument("--modes", default="warm,cold", help="comma-separated modes: warm (cached key set) and/or cold (unique keys)")
+    parser.add_argument("--concurrency", default="1,10,50", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario and level")
+    parser.add_argument("--warmup", type=int, default=50, help="unmeasured requests before each scenario")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub upstream latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="stub latency jitter in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="stub 503 rate")
+    parser.add_argument("--alerts", type=int, default=150, help="alerts per state feed")
+    parser.add_argument("--max-age", type=int, default=30, help="stub Cache-Control max-age")
+    parser.add_argument("--save", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 when a regression is flagged")
+    parser.add_argument("--log", help="write stub/server output to this file")
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    if not set(modes) <= {"warm", "cold"}:
+        parser.error("--modes accepts warm and cold")
+    levels = [int(c) for c in args.concurrency.split(",")]
+    processes, server_url, stub_url = start_processes(args)
+    try:
+        results, warmups = [], []
+        offset = 0  # Cold keys are never reused, across scenarios, levels and warmups
+        for mode in modes:
+            for scenario in scenarios:
+                if args.warmup:
+                    warmups.append(asyncio.run(run_level(server_url, stub_url, scenario, min(levels), args.warmup, mode, offset)))
+                    offset += args.warmup
+                for level in levels:
+                    results.append(asyncio.run(run_level(server_url, stub_url, scenario, level, args.requests, mode, offset)))
+                    offset += args.requests
+    finally:
+        stop_processes(processes)
+
+    print_results(results, warmups)
+    if args.save:
+        meta = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "stub": {"latency": args.latency, "jitter": args.jitter, "error_rate": args.error_rate,
+                     "alerts": args.alerts, "max_age": args.max_age},
+        }
+        with open(args.save, "w") as f:
+            json.dump({"meta": meta, "warmup": warmups, "results": results}, f, indent=2)
+        print(f"\nSaved results to {args.save}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressed = compare(results, json.load(f), args.threshold)
+        if regressed and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Local stand-in for api.weather.gov used by the load test.
+
+Serves the endpoints the MCP server calls (/alerts/active/area/{state},
+/alerts/active/zone/{zone}, /points/{lat},{lon} and
+/gridpoints/{office}/{x},{y}/forecast) with payloads built from
+benchmarks.fixtures, plus configurable latency, jitter, error rate and
+Cache-Control max-age. Payloads are encoded once per key so the stub itself
+stays cheap under load.
+
+GET /__stats returns request counts per endpoint and POST /__reset clears
+them, so a load test can attribute upstream calls to each run.
+
+Usage (from the repository root):
+    python -m benchmarks.nws_stub [--port 8081] [--latency 0.05] [--error-rate 0.01] [--alerts 150]
+
+Then start the server with NWS_API_BASE=http://127.0.0.1:8081.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import zlib
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.responses import Response
+
+from benchmarks.fixtures import make_alerts_payload, make_forecast_payload, make_points_payload
+
+
+def create_app(
+    base_url: str,
+    latency: float = 0.05,
+    jitter: float = 0.02,
+    error_rate: float = 0.0,
+    alerts: int = 150,
+    periods: int = 14,
+    max_age: int = 30,
+    seed: int = 0
+) -> FastAPI:
+    """Build the stub app; base_url is where it is reachable (used in /points forecast links)."""
+    app = FastAPI(title="NWS stub")
+    rng = random.Random(seed)
+    counts: Counter = Counter()
+    encoded: dict = {}
+
+    def payload(key: tuple, build) -> bytes:
+        body = encoded.get(key)
+        if body is None:
+            body = encoded[key] = json.dumps(build()).encode("utf-8")
+        return body
+
+    async def respond(endpoint: str, key: tuple, build) -> Response:
+        counts[endpoint] += 1
+        delay = max(0.0, latency + rng.uniform(-jitter, jitter))
+        if delay:
+            await asyncio.sleep(delay)
+        if error_rate and rng.random() < error_rate:
+            counts["errors"] += 1
+            return Response(status_code=503, content=b'{"title": "Service Unavailable"}', media_type="application/problem+json")
+        return Response(
+            content=payload(key, build),
+            media_type="application/geo+json",
+            headers={"Cache-Control": f"public, max-age={max_age}"}
+        )
+
+    @app.get("/alerts/active/area/{area}")
+    async def alerts_by_area(area: str):
+        area = area.upper()
+        return await respond("alerts", ("area", area), lambda: make_alerts_payload(alerts, area, seed=zlib.crc32(area.encode())))
+
+    @app.get("/alerts/active/zone/{zone}")
+    async def alerts_by_zone(zone: str):
+        zone = zone.upper()
+        return await respond("alerts", ("zone", zone), lambda: make_alerts_payload(max(1, alerts // 10), zone[:2], seed=zlib.crc32(zone.encode())))
+
+    @app.get("/points/{coordinates}")
+    async def points(coordinates: str):
+        latitude, _, longitude = coordinates.partition(",")
+        lat, lon = float(latitude), float(longitude)
+        return await respond("points", ("points", lat, lon), lambda: make_points_payload(lat, lon, base_url))
+
+    @app.get("/gridpoints/{office}/{grid}/forecast")
+    async def forecast(office: str, grid: str):
+        return await respond("gridpoints", ("forecast", office, grid), lambda: make_forecast_payload(periods))
+
+    @app.get("/__stats")
+    async def stats():
+        return {"requests": sum(v for k, v in counts.items() if k != "errors"), **counts}
+
+    @app.post("/__reset")
+    async def reset():
+        counts.clear()
+        return {"status": "ok"}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.05, help="mean upstream latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="uniform +/- jitter in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--alerts", type=int, default=150, help="alerts per state feed")
+    parser.add_argument("--periods", type=int, default=14, help="periods per forecast")
+    parser.add_argument("--max-age", type=int, default=30, help="Cache-Control max-age in seconds")
+    args = parser.parse_args()
+
+    import uvicorn
+    app = create_app(
+        f"http://{args.host}:{args.port}",
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        alerts=args.alerts,
+        periods=args.periods,
+        max_age=args.max_age
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
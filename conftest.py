@@ -0,0 +1,85 @@
+"""
+Shared fixtures for the offline tests (run with `python -m pytest`).
+
+main.py reads its configuration when it is imported, so the environment is
+set here first. NWS traffic goes to an httpx.MockTransport; nothing touches
+the network. test_azure_auth.py and test_http_client.py are manual scripts
+against a running server and are not collected.
+"""
+
+import os
+
+os.environ.update({
+    "MCP_API_KEYS": ";".join([
+        "test-key-full-0123456789:Full Client:tools,resources",
+        "test-key-other-0123456789:Other Client:tools,resources",
+        "test-key-limited-0123456789:Limited Client:tools,resources:rate=1,burst=2",
+    ]),
+    "MCP_API_KEYS_SOURCE": "env",
+    "CACHE_L2_BACKEND": "none",
+    "CACHE_SNAPSHOT_PATH": "",
+    "CACHE_REFRESH_ENABLED": "false",
+    "NWS_RETRY_BACKOFF_BASE": "0",
+    "NWS_API_BASE": "https://api.weather.gov",
+})
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+collect_ignore = ["test_azure_auth.py", "test_http_client.py"]
+
+FULL_KEY = "test-key-full-0123456789"
+OTHER_KEY = "test-key-other-0123456789"
+LIMITED_KEY = "test-key-limited-0123456789"
+
+
+class FakeNWS:
+    """MockTransport handler that records requests and answers with self.handler (default: empty 200)."""
+
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+        self.handler = lambda request: httpx.Response(200, json={"features": []}, headers={"Cache-Control": "max-age=60"})
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return self.handler(request)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def upstream() -> FakeNWS:
+    return FakeNWS()
+
+
+@pytest.fixture
+def nws_client(upstream: FakeNWS):
+    """A fresh NWSClient whose upstream is the FakeNWS."""
+    client = main.NWSClient()
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+    return client
+
+
+@pytest.fixture
+def app_client(upstream: FakeNWS):
+    """TestClient for the app, with the shared NWS client routed to the FakeNWS and per-test state reset."""
+    main.nws_client.cache.clear()
+    main.nws_client.breakers.clear()
+    main.points_cache.clear()
+    main.rate_limiter._buckets.clear()
+    main.rate_limiter._in_flight.clear()
+    main.nws_client._client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+    with TestClient(main.app) as client:
+        yield client
+    for session_id in list(main.session_manager.sessions):
+        main.session_manager.close(session_id)
+
+
+def auth_for(key: str) -> main.AuthInfo:
+    return main.authenticate_api_key(key)
@@ -1,60 +1,222 @@
 from fastapi import FastAPI, HTTPException, Request, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel
-from typing import Any, Dict, Optional, Annotated
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Annotated
 import logging
 import asyncio
+import contextvars
+import math
+import hashlib
+import hmac
+import json
 from contextlib import asynccontextmanager
 import httpx
 import os
-from datetime import datetime
+import random
+import re
+import secrets
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Weather API Constants
-NWS_API_BASE = "https://api.weather.gov"
+# Weather API Constants (NWS_API_BASE can point at a local stub for benchmarks)
+NWS_API_BASE = os.getenv("NWS_API_BASE", "https://api.weather.gov").rstrip("/")
 USER_AGENT = "weather-app/1.0"
 
+# Upstream HTTP client configuration (shared, pooled client for all NWS traffic)
+NWS_MAX_CONNECTIONS = int(os.getenv("NWS_MAX_CONNECTIONS", "100"))
+NWS_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("NWS_MAX_KEEPALIVE_CONNECTIONS", "20"))
+NWS_KEEPALIVE_EXPIRY = float(os.getenv("NWS_KEEPALIVE_EXPIRY", "30.0"))
+NWS_HTTP2 = os.getenv("NWS_HTTP2", "false").lower() in ("1", "true", "yes")
+NWS_CONNECT_TIMEOUT = float(os.getenv("NWS_CONNECT_TIMEOUT", "5.0"))
+NWS_READ_TIMEOUT = float(os.getenv("NWS_READ_TIMEOUT", "30.0"))
+NWS_WRITE_TIMEOUT = float(os.getenv("NWS_WRITE_TIMEOUT", "10.0"))
+NWS_POOL_TIMEOUT = float(os.getenv("NWS_POOL_TIMEOUT", "5.0"))
+
+# /points lookup cache (coordinate -> gridpoint forecast URL)
+POINTS_CACHE_MAXSIZE = int(os.getenv("POINTS_CACHE_MAXSIZE", "10000"))
+POINTS_CACHE_TTL = float(os.getenv("POINTS_CACHE_TTL", "86400"))
+# NWS only accepts up to 4 decimal places for /points coordinates
+POINTS_COORDINATE_PRECISION = 4
+
+# Upstream response cache (parsed NWS payloads keyed by URL)
+RESPONSE_CACHE_MAXSIZE = int(os.getenv("RESPONSE_CACHE_MAXSIZE", "1024"))
+RESPONSE_CACHE_DEFAULT_TTL = float(os.getenv("RESPONSE_CACHE_DEFAULT_TTL", "60"))
+RESPONSE_CACHE_MAX_TTL = float(os.getenv("RESPONSE_CACHE_MAX_TTL", "3600"))
+RESPONSE_CACHE_STALE_WHILE_REVALIDATE = float(os.getenv("RESPONSE_CACHE_STALE_WHILE_REVALIDATE", "30"))
+# Oldest expired payload that may still be served when the upstream is failing (seconds past expiry)
+RESPONSE_CACHE_MAX_STALE = float(os.getenv("RESPONSE_CACHE_MAX_STALE", "3600"))
+
+# Shared second-tier cache behind the in-process response and /points caches:
+#   "none"                  - every worker keeps its own caches only
+#   "sqlite:<path>"         - local SQLite file shared by all workers on the host
+#   "redis://host:port/db"  - any Redis-compatible server (requires the 'redis' package)
+CACHE_L2_BACKEND = os.getenv("CACHE_L2_BACKEND", "none")
+CACHE_L2_PREFIX = os.getenv("CACHE_L2_PREFIX", "weather-mcp:")
+CACHE_L2_TIMEOUT = float(os.getenv("CACHE_L2_TIMEOUT", "0.25"))
+
+# Upstream bulkhead: bounds outstanding NWS calls and how long callers may queue for one
+NWS_MAX_CONCURRENCY = int(os.getenv("NWS_MAX_CONCURRENCY", "50"))
+NWS_MAX_QUEUE = int(os.getenv("NWS_MAX_QUEUE", "200"))
+NWS_QUEUE_TIMEOUT = float(os.getenv("NWS_QUEUE_TIMEOUT", "2.0"))
+
+# Upstream resilience: bounded retries with jittered backoff, per-endpoint circuit breakers
+NWS_RETRY_ATTEMPTS = int(os.getenv("NWS_RETRY_ATTEMPTS", "2"))
+NWS_RETRY_BACKOFF_BASE = float(os.getenv("NWS_RETRY_BACKOFF_BASE", "0.2"))
+NWS_RETRY_BACKOFF_MAX = float(os.getenv("NWS_RETRY_BACKOFF_MAX", "2.0"))
+NWS_BREAKER_FAILURE_THRESHOLD = int(os.getenv("NWS_BREAKER_FAILURE_THRESHOLD", "5"))
+NWS_BREAKER_RECOVERY_TIME = float(os.getenv("NWS_BREAKER_RECOVERY_TIME", "30"))
+
+# Background refresh of hot cache entries ahead of expiry
+CACHE_REFRESH_ENABLED = os.getenv("CACHE_REFRESH_ENABLED", "true").lower() in ("1", "true", "yes")
+CACHE_REFRESH_INTERVAL = float(os.getenv("CACHE_REFRESH_INTERVAL", "15"))
+CACHE_REFRESH_HOT_KEYS = int(os.getenv("CACHE_REFRESH_HOT_KEYS", "50"))
+CACHE_REFRESH_MIN_HITS = float(os.getenv("CACHE_REFRESH_MIN_HITS", "2"))
+CACHE_REFRESH_LEAD_TIME = float(os.getenv("CACHE_REFRESH_LEAD_TIME", "10"))
+CACHE_REFRESH_BUDGET = int(os.getenv("CACHE_REFRESH_BUDGET", "60"))
+# Popularity scores are multiplied by this every refresh cycle so old traffic fades out
+CACHE_REFRESH_DECAY = 0.9
+
+# Cache snapshot for warm restarts: hot responses and /points lookups are written to this file
+# on shutdown and every interval, and reloaded in the background at startup ("" disables)
+CACHE_SNAPSHOT_PATH = os.getenv("CACHE_SNAPSHOT_PATH", "cache-snapshot.json")
+CACHE_SNAPSHOT_INTERVAL = float(os.getenv("CACHE_SNAPSHOT_INTERVAL", "300"))
+CACHE_SNAPSHOT_MAX_ENTRIES = int(os.getenv("CACHE_SNAPSHOT_MAX_ENTRIES", "500"))
+
+# Memoized renderings of upstream alert/forecast objects (text and structured)
+RENDER_CACHE_MAXSIZE = int(os.getenv("RENDER_CACHE_MAXSIZE", "4096"))
+
+# Maximum states/zones one get_alerts call may fan out to
+MCP_ALERTS_MAX_AREAS = int(os.getenv("MCP_ALERTS_MAX_AREAS", "20"))
+
+# get_forecast_batch limits: points per call and concurrent upstream lookups
+MCP_FORECAST_BATCH_MAX_POINTS = int(os.getenv("MCP_FORECAST_BATCH_MAX_POINTS", "100"))
+MCP_FORECAST_BATCH_CONCURRENCY = int(os.getenv("MCP_FORECAST_BATCH_CONCURRENCY", "8"))
+# NWS forecasts cover 7 days as 14 day/night periods
+FORECAST_MAX_PERIODS = 14
+
+# Streamable HTTP sessions and resource subscriptions
+MCP_SESSION_TTL = float(os.getenv("MCP_SESSION_TTL", "3600"))
+MCP_MAX_SESSIONS = int(os.getenv("MCP_MAX_SESSIONS", "1000"))
+# Key that signs Mcp-Session-Id values; set the same value on every worker so any of them can
+# verify an id (a random per-process key is used when unset)
+MCP_SESSION_SECRET = os.getenv("MCP_SESSION_SECRET", "")
+MCP_MAX_SESSIONS_PER_KEY = int(os.getenv("MCP_MAX_SESSIONS_PER_KEY", "20"))
+MCP_MAX_SUBSCRIPTIONS_PER_SESSION = int(os.getenv("MCP_MAX_SUBSCRIPTIONS_PER_SESSION", "20"))
+MCP_MAX_SUBSCRIPTIONS_PER_KEY = int(os.getenv("MCP_MAX_SUBSCRIPTIONS_PER_KEY", "60"))
+MCP_SESSION_QUEUE_SIZE = int(os.getenv("MCP_SESSION_QUEUE_SIZE", "100"))
+MCP_SUBSCRIPTION_POLL_INTERVAL = float(os.getenv("MCP_SUBSCRIPTION_POLL_INTERVAL", "60"))
+MCP_STREAM_HEARTBEAT = float(os.getenv("MCP_STREAM_HEARTBEAT", "15"))
+
+# Prometheus metrics (GET /metrics); recording can be switched off entirely
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+# Latency histogram bucket upper bounds, in seconds
+METRICS_LATENCY_BUCKETS = tuple(
+    float(b) for b in os.getenv("METRICS_LATENCY_BUCKETS", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10").split(",")
+)
+
+# Tracing: "none" (default), "file:<path>" (JSON lines, works offline) or "otel" (OpenTelemetry SDK)
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none")
+# Where admin-triggered CPU profiles are written
+PROFILE_OUTPUT_DIR = os.getenv("PROFILE_OUTPUT_DIR", "profiles")
+
+# JSON-RPC batch limits for /mcp/stream
+MCP_BATCH_MAX_SIZE = int(os.getenv("MCP_BATCH_MAX_SIZE", "50"))
+MCP_BATCH_CONCURRENCY = int(os.getenv("MCP_BATCH_CONCURRENCY", "8"))
+
+# JSON encoding backend: "auto" picks orjson, then msgspec, then the stdlib json module
+MCP_JSON_BACKEND = os.getenv("MCP_JSON_BACKEND", "auto").lower()
+
+def _stdlib_json_dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def _select_json_backend(name: str) -> tuple[str, Callable[[Any], bytes], Callable[[bytes | str], Any], tuple]:
+    """Return (name, dumps, loads, decode errors) for the configured JSON backend."""
+    if name in ("auto", "orjson"):
+        try:
+            import orjson
+            return "orjson", orjson.dumps, orjson.loads, (ValueError,)
+        except ImportError:
+            if name == "orjson":
+                logger.warning("⚠️  MCP_JSON_BACKEND=orjson but orjson is not installed - using stdlib json")
+    if name in ("auto", "msgspec"):
+        try:
+            import msgspec
+            return "msgspec", msgspec.json.Encoder().encode, msgspec.json.Decoder().decode, (ValueError, msgspec.DecodeError)
+        except ImportError:
+            if name == "msgspec":
+                logger.warning("⚠️  MCP_JSON_BACKEND=msgspec but msgspec is not installed - using stdlib json")
+    return "json", _stdlib_json_dumps, json.loads, (ValueError,)
+
+JSON_BACKEND, encode_json, decode_json, JSON_DECODE_ERRORS = _select_json_backend(MCP_JSON_BACKEND)
+
 # Authentication Configuration
 # SECURITY WARNING: Configure your own API keys via environment variables!
 # The server will not start without proper API key configuration.
 
-VALID_API_KEYS = {}
+# Where API keys are loaded from:
+#   "env"            - MCP_API_KEYS environment variable (read once at startup)
+#   "file:<path>"    - local file, polled for changes (JSON or the MCP_API_KEYS format)
+#   "sqlite:<path>"  - local SQLite database with an api_keys table, polled for changes
+MCP_API_KEYS_SOURCE = os.getenv("MCP_API_KEYS_SOURCE", "env")
+MCP_API_KEYS_POLL_INTERVAL = float(os.getenv("MCP_API_KEYS_POLL_INTERVAL", "5"))
+
+# Per-client quotas, used when a key does not set its own limits (0 = unlimited)
+MCP_RATE_LIMIT_RATE = float(os.getenv("MCP_RATE_LIMIT_RATE", "0"))
+MCP_RATE_LIMIT_BURST = int(os.getenv("MCP_RATE_LIMIT_BURST", "0"))
+MCP_RATE_LIMIT_MAX_IN_FLIGHT = int(os.getenv("MCP_RATE_LIMIT_MAX_IN_FLIGHT", "0"))
+# "memory" (per worker) or "sqlite:<path>" to share token buckets between workers on one host
+MCP_RATE_LIMIT_BACKEND = os.getenv("MCP_RATE_LIMIT_BACKEND", "memory")
 
-# Load API keys configuration
-# Priority: Environment variables > Placeholder values (for demo/development)
+def parse_limits(spec: str) -> Dict[str, float]:
+    """Parse "rate=10,burst=20,concurrency=4" into rate / burst / max_in_flight settings."""
+    names = {"rate": "rate", "burst": "burst", "concurrency": "max_in_flight", "max_in_flight": "max_in_flight"}
+    limits = {}
+    for item in spec.split(","):
+        name, _, value = item.partition("=")
+        name = name.strip().lower()
+        if name in names and value.strip():
+            limits[names[name]] = float(value)
+    return limits
 
-# 1. First, try loading from environment variables (RECOMMENDED for production)
-# Format: "key1:client_name1:permission1,permission2;key2:client_name2:permission1"
-# Example: "abc123:MyClient:tools,resources;def456:LimitedClient:tools"
-if os.getenv("MCP_API_KEYS"):
-    logger.info("🔑 Loading API keys from environment variables")
-    env_keys = os.getenv("MCP_API_KEYS").split(";")
-    for key_config in env_keys:
+def parse_api_keys(spec: str, source: str) -> Dict[str, Dict[str, Any]]:
+    """Parse "key1:client_name1:permission1,permission2;key2:client_name2:permission1".
+
+    Entries may be separated by ";" or newlines, and may end with an optional
+    limits segment, e.g. "key1:client_name1:tools:rate=5,burst=10,concurrency=2".
+    """
+    keys = {}
+    for key_config in spec.replace("\n", ";").split(";"):
         parts = key_config.split(":")
         if len(parts) >= 3:
             key = parts[0].strip()
             name = parts[1].strip()
             permissions = [p.strip() for p in parts[2].split(",")]
-            VALID_API_KEYS[key] = {
+            keys[key] = {
                 "name": name,
                 "permissions": permissions,
                 "created": datetime.now().isoformat(),
-                "source": "environment"
+                "source": source,
+                **(parse_limits(parts[3]) if len(parts) >= 4 else {})
             }
-else:
-    # 2. Fallback to placeholder values for demo/development
+    return keys
+
+def placeholder_api_keys() -> Dict[str, Dict[str, Any]]:
+    """Placeholder API keys for demo/development - REPLACE WITH YOUR OWN!"""
     logger.warning("⚠️  Using placeholder API keys for demo purposes")
     logger.warning("🔒 For production, set MCP_API_KEYS environment variable")
     logger.warning("Example: MCP_API_KEYS='your-secure-key-123:My Client:tools,resources'")
     logger.error("❌ PLACEHOLDER KEYS WILL NOT WORK - Replace <> placeholders with actual keys!")
     
-    # Placeholder API keys for demo/development - REPLACE WITH YOUR OWN!
-    VALID_API_KEYS = {
+    return {
         "<YOUR-DEMO-API-KEY>": {
             "name": "Demo Client (REPLACE WITH YOUR KEY)",
             "permissions": ["tools", "resources"],
@@ -82,15 +244,395 @@ class Resource(BaseModel):
     mimeType: Optional[str] = None
 
 class AuthInfo(BaseModel):
-    key: str
+    """Authenticated client principal, built once per API key and shared across requests."""
+    model_config = ConfigDict(frozen=True)
+
+    key_id: str
     client_name: str
-    permissions: list[str]
+    permissions: frozenset[str]
+    # Quotas: requests per second, bucket size and concurrent requests (0 = unlimited)
+    rate: float = 0.0
+    burst: int = 0
+    max_in_flight: int = 0
+
+# API key index: SHA-256 digest of the key -> precompiled principal.
+# Raw keys are never compared directly; the dict lookup compares digests, so
+# lookup timing reveals nothing about the key material.
+def hash_api_key(api_key: str) -> bytes:
+    """Digest used to index and look up API keys."""
+    return hashlib.sha256(api_key.encode("utf-8")).digest()
+
+def build_api_key_index(
+    keys: Dict[str, Dict[str, Any]],
+    previous: Optional[Dict[bytes, AuthInfo]] = None
+) -> Dict[bytes, AuthInfo]:
+    """Precompile configured API keys into a digest -> AuthInfo index.
+
+    Principals from a previous index are reused for unchanged keys, so
+    anything keyed on them stays warm across reloads.
+    """
+    previous = previous or {}
+    index = {}
+    for key, info in keys.items():
+        digest = hash_api_key(key)
+        rate = float(info.get("rate", MCP_RATE_LIMIT_RATE))
+        auth = AuthInfo(
+            key_id=digest.hex()[:12],
+            client_name=info["name"],
+            permissions=frozenset(info["permissions"]),
+            rate=rate,
+            burst=int(info.get("burst", MCP_RATE_LIMIT_BURST) or max(1, math.ceil(rate))),
+            max_in_flight=int(info.get("max_in_flight", MCP_RATE_LIMIT_MAX_IN_FLIGHT))
+        )
+        index[digest] = previous.get(digest) if previous.get(digest) == auth else auth
+    return index
+
+class APIKeyStore:
+    """API keys loaded from a pluggable source and swapped in atomically on change.
+
+    Request handlers only ever read self.index (a single attribute load), so
+    lookups take no lock; a reload builds a complete new index and replaces
+    the old one in one assignment.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        kind, _, self.path = source.partition(":")
+        self.kind = kind.lower()
+        if self.kind not in ("env", "file", "sqlite") or (self.kind != "env" and not self.path):
+            raise ValueError(f"Invalid MCP_API_KEYS_SOURCE '{source}' - use env, file:<path> or sqlite:<path>")
+        self.keys: Dict[str, Dict[str, Any]] = {}
+        self.index: Dict[bytes, AuthInfo] = {}
+        self.version = 0
+        self.last_reload: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self._fingerprint: Optional[bytes] = None
+        self._file_stat: Optional[tuple[int, int]] = None
+
+    @property
+    def reloadable(self) -> bool:
+        return self.kind != "env"
+
+    def _load_env(self) -> Dict[str, Dict[str, Any]]:
+        # Priority: Environment variables > Placeholder values (for demo/development)
+        if os.getenv("MCP_API_KEYS"):
+            logger.info("🔑 Loading API keys from environment variables")
+            return parse_api_keys(os.getenv("MCP_API_KEYS"), "environment")
+        return placeholder_api_keys()
+
+    def _load_file(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        stat = os.stat(self.path)
+        file_stat = (stat.st_mtime_ns, stat.st_size)
+        if file_stat == self._file_stat:
+            return None  # Unchanged since the last successful load
+        with open(self.path, encoding="utf-8") as f:
+            content = f.read()
+        keys = self._parse_file(content)
+        # Only remember the stat once the content parsed, so a half-written file is retried next poll
+        self._file_stat = file_stat
+        return keys
+
+    def _parse_file(self, content: str) -> Dict[str, Dict[str, Any]]:
+        if not content.lstrip().startswith(("{", "[")):
+            return parse_api_keys(content, "file")
+        # JSON: [{"key": ..., "name": ..., "permissions": [...]}, ...] or {"keys": [...]}
+        entries = json.loads(content)
+        if isinstance(entries, dict):
+            entries = entries.get("keys", [])
+        return {
+            entry["key"]: {
+                "name": entry["name"],
+                "permissions": list(entry["permissions"]),
+                "created": entry.get("created", datetime.now().isoformat()),
+                "source": "file",
+                **{limit: entry[limit] for limit in ("rate", "burst", "max_in_flight") if limit in entry}
+            }
+            for entry in entries
+        }
+
+    def _load_sqlite(self) -> Dict[str, Dict[str, Any]]:
+        # Expects: CREATE TABLE api_keys (key TEXT PRIMARY KEY, name TEXT NOT NULL, permissions TEXT NOT NULL)
+        # with permissions as a comma-separated list, plus an optional "limits" column
+        # in the "rate=10,burst=20,concurrency=4" format
+        import sqlite3
+        with sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=1.0) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute("SELECT * FROM api_keys ORDER BY key").fetchall()
+        return {
+            row["key"]: {
+                "name": row["name"],
+                "permissions": [p.strip() for p in row["permissions"].split(",") if p.strip()],
+                "created": datetime.now().isoformat(),
+                "source": "sqlite",
+                **(parse_limits(row["limits"] or "") if "limits" in row.keys() else {})
+            }
+            for row in rows
+        }
+
+    def reload(self) -> bool:
+        """Load keys from the source and swap them in if they changed; returns True on change."""
+        keys = {"env": self._load_env, "file": self._load_file, "sqlite": self._load_sqlite}[self.kind]()
+        self.last_error = None
+        if keys is None:
+            return False
+        fingerprint = hashlib.sha256(json.dumps(
+            sorted(
+                (key, info["name"], sorted(info["permissions"]), [info.get(limit) for limit in ("rate", "burst", "max_in_flight")])
+                for key, info in keys.items()
+            )
+        ).encode("utf-8")).digest()
+        if fingerprint == self._fingerprint:
+            return False
+        index = build_api_key_index(keys, self.index)
+        self.keys, self.index = keys, index
+        self._fingerprint = fingerprint
+        self.version += 1
+        self.last_reload = datetime.now().isoformat()
+        return True
+
+    async def watch(self):
+        """Poll the source and hot-swap keys when it changes (runs until cancelled)."""
+        while True:
+            await asyncio.sleep(MCP_API_KEYS_POLL_INTERVAL)
+            try:
+                if await asyncio.to_thread(self.reload):
+                    logger.info(f"🔑 Reloaded {len(self.keys)} API keys from {self.source} (version {self.version})")
+            except Exception as e:
+                # Keep serving with the last good index
+                self.last_error = str(e)
+                logger.error(f"API key reload from {self.source} failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "source": self.kind,
+            "keys": len(self.index),
+            "version": self.version,
+            "last_reload": self.last_reload,
+            "last_error": self.last_error
+        }
+
+key_store = APIKeyStore(MCP_API_KEYS_SOURCE)
+key_store.reload()
+
+# Tracing and Profiling
+class NoopSpan:
+    """Span stand-in used while tracing is off; entering it costs one method call."""
+
+    def __enter__(self) -> "NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+NOOP_SPAN = NoopSpan()
+
+class Span:
+    """A timed, attributed unit of work, exported as one JSON line in an OTLP-like shape."""
+
+    __slots__ = ("tracer", "name", "trace_id", "span_id", "parent_id", "attributes", "start_ns", "status", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any], parent: Optional["Span"]):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = attributes
+        self.start_ns = 0
+        self.status = "OK"
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        end_ns = time.time_ns()
+        _current_span.reset(self._token)
+        if exc_type is not None and not issubclass(exc_type, asyncio.CancelledError):
+            self.status = "ERROR"
+            self.attributes["exception.type"] = exc_type.__name__
+        self.tracer.export({
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": end_ns,
+            "durationMs": round((end_ns - self.start_ns) / 1e6, 3),
+            "status": self.status,
+            "attributes": self.attributes
+        }, root=self.parent_id is None)
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+class Tracer:
+    """Span-based tracing around the request hot path.
+
+    With exporter "none" every span() call returns a shared no-op span. With
+    "file:<path>" spans are buffered per trace and appended to the file as JSON
+    lines when the root span ends, so traces can be inspected fully offline.
+    With "otel" spans go to the OpenTelemetry API (configure the SDK/exporter
+    through the standard OTEL_* environment variables). Parent/child links
+    follow asyncio tasks through a context variable.
+    """
+
+    def __init__(self, spec: str):
+        kind, _, path = spec.partition(":")
+        self.kind = kind.lower()
+        self.path = path or None
+        self._buffer: list[bytes] = []
+        self._otel = None
+        self.exported = 0
+        if self.kind == "otel":
+            try:
+                from opentelemetry import trace as otel_trace
+                self._otel = otel_trace.get_tracer(__name__)
+            except ImportError:
+                logger.warning("⚠️  TRACING_EXPORTER=otel but 'opentelemetry-api' is not installed - tracing disabled")
+                self.kind = "none"
+        elif self.kind == "file":
+            if not self.path:
+                raise ValueError("TRACING_EXPORTER=file requires a path (file:<path>)")
+        elif self.kind != "none":
+            raise ValueError(f"Invalid TRACING_EXPORTER '{spec}' - use none, file:<path> or otel")
+        self.enabled = self.kind != "none"
+
+    def span(self, name: str, **attributes: Any) -> Any:
+        """Context manager timing a stage; nested spans become its children."""
+        if not self.enabled:
+            return NOOP_SPAN
+        if self._otel is not None:
+            return self._otel.start_as_current_span(name, attributes=attributes)
+        return Span(self, name, attributes, _current_span.get())
+
+    def export(self, record: Dict[str, Any], root: bool):
+        self._buffer.append(encode_json(record))
+        self.exported += 1
+        if root or len(self._buffer) >= 1000:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer or not self.path:
+            return
+        lines, self._buffer = self._buffer, []
+        try:
+            with open(self.path, "ab") as f:
+                f.write(b"\n".join(lines) + b"\n")
+        except OSError as e:
+            logger.error(f"Writing spans to {self.path} failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"exporter": self.kind, "path": self.path, "spans_exported": self.exported}
+
+tracer = Tracer(TRACING_EXPORTER)
+
+class TracingMiddleware:
+    """ASGI middleware opening the root span for each HTTP request (installed only when tracing is on)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with tracer.span(f"{scope['method']} {scope['path']}", **{"http.method": scope["method"], "http.route": scope["path"]}) as span:
+            async def send_with_status(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                await send(message)
+            await self.app(scope, receive, send_with_status)
+
+class RequestProfiler:
+    """Admin-armed CPU profiler that samples the next N MCP requests with cProfile.
+
+    cProfile observes the whole event loop thread, so work from other requests
+    running concurrently with a sampled one is included too; only one request
+    is sampled at a time. When the last sample finishes the aggregated profile
+    is written to PROFILE_OUTPUT_DIR as .pstats plus a text summary.
+    """
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self._profile = None
+        self.remaining = 0
+        self.sampled = 0
+        self._active = False
+        self.last_dump: Optional[Dict[str, Any]] = None
+
+    def arm(self, requests: int):
+        import cProfile
+        self._profile = cProfile.Profile()
+        self.remaining = requests
+        self.sampled = 0
+
+    @asynccontextmanager
+    async def sample(self):
+        if self.remaining <= 0 or self._active:
+            yield
+            return
+        self.remaining -= 1
+        self._active = True
+        self._profile.enable()
+        try:
+            yield
+        finally:
+            self._profile.disable()
+            self._active = False
+            self.sampled += 1
+            if self.remaining == 0:
+                self.dump()
+
+    def dump(self):
+        import io
+        import pstats
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"profile-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}")
+        self._profile.dump_stats(base + ".pstats")
+        report = io.StringIO()
+        pstats.Stats(self._profile, stream=report).sort_stats("cumulative").print_stats(40)
+        with open(base + ".txt", "w") as f:
+            f.write(report.getvalue())
+        self.last_dump = {
+            "requests": self.sampled,
+            "pstats": base + ".pstats",
+            "report": base + ".txt",
+            "created": datetime.now(timezone.utc).isoformat()
+        }
+        self._profile = None
+        logger.info(f"🔬 CPU profile of {self.sampled} requests written to {base}.pstats")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "armed": self.remaining > 0,
+            "remaining": self.remaining,
+            "sampled": self.sampled,
+            "last_dump": self.last_dump
+        }
+
+request_profiler = RequestProfiler(PROFILE_OUTPUT_DIR)
+
+class FastJSONResponse(Response):
+    """JSON response rendered with the fastest available JSON backend."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        with tracer.span("json.encode"):
+            return encode_json(content)
 
 # Authentication Functions
 security = HTTPBearer()
 
-async def get_api_key_from_header(authorization: Annotated[str | None, Header()] = None) -> str:
-    """Extract API key from Authorization header."""
+def parse_authorization(authorization: Optional[str]) -> str:
+    """Extract the API key from an Authorization header value."""
     if not authorization:
         raise HTTPException(
             status_code=401,
@@ -106,9 +648,19 @@ async def get_api_key_from_header(authorization: Annotated[str | None, Header()]
     
     return api_key
 
+async def get_api_key_from_header(authorization: Annotated[str | None, Header()] = None) -> str:
+    """Extract API key from Authorization header."""
+    return parse_authorization(authorization)
+
 async def authenticate_request(api_key: str = Depends(get_api_key_from_header)) -> AuthInfo:
     """Validate API key and return authentication info."""
-    if api_key not in VALID_API_KEYS:
+    return authenticate_api_key(api_key)
+
+def authenticate_api_key(api_key: str) -> AuthInfo:
+    """Validate an API key and return authentication info."""
+    with tracer.span("auth.authenticate"):
+        auth = key_store.index.get(hash_api_key(api_key))
+    if auth is None:
         logger.warning(f"Invalid API key attempted: {api_key[:8]}...")
         raise HTTPException(
             status_code=401,
@@ -116,41 +668,1507 @@ async def authenticate_request(api_key: str = Depends(get_api_key_from_header))
             headers={"WWW-Authenticate": "Bearer"}
         )
     
-    client_info = VALID_API_KEYS[api_key]
-    logger.info(f"Authenticated client: {client_info['name']}")
-    
-    return AuthInfo(
-        key=api_key,
-        client_name=client_info["name"],
-        permissions=client_info["permissions"]
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Authenticated client: {auth.client_name}")
+    return auth
 
 def require_permission(permission: str):
     """Dependency factory to require specific permissions."""
     async def check_permission(auth: AuthInfo = Depends(authenticate_request)) -> AuthInfo:
-        if permission not in auth.permissions:
-            raise HTTPException(
-                status_code=403,
-                detail=f"Permission '{permission}' required"
-            )
+        with tracer.span("auth.permission", permission=permission):
+            if permission not in auth.permissions:
+                raise HTTPException(
+                    status_code=403,
+                    detail=f"Permission '{permission}' required"
+                )
         return auth
     return check_permission
 
+class RateLimiter:
+    """Per-client token-bucket rate limits and max-in-flight quotas.
+
+    Buckets live in process memory by default. With an "sqlite:<path>" backend
+    they are kept in a shared SQLite file so limits hold across all workers on
+    the host; in-flight quotas are always enforced per worker.
+    """
+
+    def __init__(self, backend: str):
+        kind, _, path = backend.partition(":")
+        if kind not in ("memory", "sqlite") or (kind == "sqlite" and not path):
+            raise ValueError(f"Invalid MCP_RATE_LIMIT_BACKEND '{backend}' - use memory or sqlite:<path>")
+        self.backend = kind
+        self._db_path = path or None
+        self._db_ready = False
+        self._buckets: Dict[str, list[float]] = {}  # key_id -> [tokens, last refill]
+        self._in_flight: Dict[str, int] = {}
+        self.allowed = 0
+        self.rejected_rate = 0
+        self.rejected_concurrency = 0
+        self.rejected_burst = 0
+        self.rejected_by_client: Dict[str, int] = {}
+
+    def _take_local(self, auth: AuthInfo, cost: int) -> float:
+        """Take tokens from the in-process bucket; returns seconds to wait, 0 if allowed."""
+        now = time.monotonic()
+        bucket = self._buckets.get(auth.key_id)
+        if bucket is None:
+            bucket = self._buckets[auth.key_id] = [float(auth.burst), now]
+        tokens = min(float(auth.burst), bucket[0] + (now - bucket[1]) * auth.rate)
+        bucket[1] = now
+        if tokens >= cost:
+            bucket[0] = tokens - cost
+            return 0.0
+        bucket[0] = tokens
+        return (cost - tokens) / auth.rate
+
+    def _take_shared(self, auth: AuthInfo, cost: int) -> float:
+        """Take tokens from the bucket in the shared SQLite file (runs in a worker thread)."""
+        import sqlite3
+        conn = sqlite3.connect(self._db_path, timeout=1.0, isolation_level=None)
+        try:
+            if not self._db_ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("CREATE TABLE IF NOT EXISTS rate_limits (key_id TEXT PRIMARY KEY, tokens REAL, updated REAL)")
+                self._db_ready = True
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = conn.execute("SELECT tokens, updated FROM rate_limits WHERE key_id = ?", (auth.key_id,)).fetchone()
+            tokens = float(auth.burst) if row is None else min(float(auth.burst), row[0] + (now - row[1]) * auth.rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / auth.rate
+            conn.execute("INSERT OR REPLACE INTO rate_limits (key_id, tokens, updated) VALUES (?, ?, ?)", (auth.key_id, tokens, now))
+            conn.execute("COMMIT")
+            return wait
+        finally:
+            conn.close()
+
+    def _reject(self, auth: AuthInfo, reason: str, retry_after: float):
+        # Counted per client rather than logged at WARNING, so an abusive client cannot flood the log
+        self.rejected_by_client[auth.client_name] = self.rejected_by_client.get(auth.client_name, 0) + 1
+        logger.debug(f"Rate limited client {auth.client_name}: {reason}")
+        raise HTTPException(
+            status_code=429,
+            detail=f"Rate limit exceeded: {reason}",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+
+    async def acquire(self, auth: AuthInfo, cost: int = 1):
+        """Admit a request costing `cost` tokens or raise a 429 HTTPException.
+
+        A request costing more than the client's burst could never be admitted,
+        so it is rejected outright rather than charged a capped cost.
+        """
+        if auth.rate > 0 and cost > auth.burst:
+            self.rejected_burst += 1
+            self._reject(auth, f"request costs {cost} tokens, more than the burst of {auth.burst}", cost / auth.rate)
+        in_flight = self._in_flight.get(auth.key_id, 0)
+        if auth.max_in_flight and in_flight >= auth.max_in_flight:
+            self.rejected_concurrency += 1
+            self._reject(auth, f"more than {auth.max_in_flight} concurrent requests", 1)
+        self._in_flight[auth.key_id] = in_flight + 1
+        
+        if auth.rate > 0 and cost > 0:
+            if self._db_path:
+                wait = await asyncio.to_thread(self._take_shared, auth, cost)
+            else:
+                wait = self._take_local(auth, cost)
+            if wait > 0:
+                self.release(auth)
+                self.rejected_rate += 1
+                self._reject(auth, f"{auth.rate:g} requests per second", wait)
+        self.allowed += 1
+
+    def release(self, auth: AuthInfo):
+        """Give back the in-flight slot taken by acquire()."""
+        remaining = self._in_flight.get(auth.key_id, 0) - 1
+        if remaining > 0:
+            self._in_flight[auth.key_id] = remaining
+        else:
+            self._in_flight.pop(auth.key_id, None)
+
+    @asynccontextmanager
+    async def limit(self, auth: AuthInfo, cost: int = 1):
+        await self.acquire(auth, cost)
+        try:
+            yield
+        finally:
+            self.release(auth)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "allowed": self.allowed,
+            "rejected_rate": self.rejected_rate,
+            "rejected_concurrency": self.rejected_concurrency,
+            "rejected_burst": self.rejected_burst,
+            "rejected_by_client": dict(self.rejected_by_client),
+            "in_flight": sum(self._in_flight.values())
+        }
+
+rate_limiter = RateLimiter(MCP_RATE_LIMIT_BACKEND)
+
+# Metrics
+class Histogram:
+    """Fixed-bucket latency histogram; observe() is one bisect and three increments."""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, bucket_count: int):
+        self.counts = [0] * (bucket_count + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def format_labels(labels: tuple) -> str:
+    """Render ((name, value), ...) as a Prometheus label set."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels) + "}"
+
+class MetricsRegistry:
+    """Counters, in-flight gauges and latency histograms in the Prometheus text format.
+
+    All recording happens on the event loop thread, so series are plain dicts
+    and integers updated without locks. Labels are tuples of (name, value)
+    pairs and are only formatted when /metrics is scraped, keeping the
+    per-request cost to a dict lookup and a few increments.
+    """
+
+    def __init__(self, buckets: tuple[float, ...], enabled: bool = True):
+        self.buckets = tuple(sorted(buckets))
+        self.enabled = enabled
+        self._families: Dict[str, tuple[str, str]] = {}  # name -> (type, help)
+        self._histograms: Dict[str, Dict[tuple, Histogram]] = {}
+        self._counters: Dict[str, Dict[tuple, float]] = {}
+        self.in_flight: Dict[str, Dict[tuple, int]] = {}
+
+    def histogram(self, name: str, help_text: str):
+        self._families[name] = ("histogram", help_text)
+        self._histograms[name] = {}
+
+    def counter(self, name: str, help_text: str):
+        self._families[name] = ("counter", help_text)
+        self._counters[name] = {}
+
+    def gauge(self, name: str, help_text: str):
+        self._families[name] = ("gauge", help_text)
+        self.in_flight[name] = {}
+
+    def observe(self, name: str, labels: tuple, value: float):
+        if not self.enabled:
+            return
+        series = self._histograms[name]
+        histogram = series.get(labels)
+        if histogram is None:
+            histogram = series[labels] = Histogram(len(self.buckets))
+        histogram.counts[bisect_left(self.buckets, value)] += 1
+        histogram.sum += value
+        histogram.count += 1
+
+    def inc(self, name: str, labels: tuple, amount: float = 1):
+        if not self.enabled:
+            return
+        series = self._counters[name]
+        series[labels] = series.get(labels, 0) + amount
+
+    def track(self, name: str, labels: tuple, delta: int):
+        """Adjust an in-flight gauge (+1 on entry, -1 on exit)."""
+        if not self.enabled:
+            return
+        series = self.in_flight[name]
+        series[labels] = series.get(labels, 0) + delta
+
+    def render(self, snapshot: list[tuple[str, str, str, list[tuple[tuple, float]]]] = ()) -> str:
+        """Prometheus text exposition of all recorded series plus (name, type, help, samples) snapshot families."""
+        lines = []
+        bounds = [format(b, "g") for b in self.buckets] + ["+Inf"]
+        for name, (kind, help_text) in self._families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "histogram":
+                for labels, histogram in self._histograms[name].items():
+                    cumulative = 0
+                    for bound, count in zip(bounds, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{format_labels(labels + (('le', bound),))} {cumulative}")
+                    lines.append(f"{name}_sum{format_labels(labels)} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+            else:
+                series = self._counters[name] if kind == "counter" else self.in_flight[name]
+                for labels, value in series.items():
+                    lines.append(f"{name}{format_labels(labels)} {value:g}")
+        for name, kind, help_text, samples in snapshot:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{format_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry(METRICS_LATENCY_BUCKETS, enabled=METRICS_ENABLED)
+metrics.histogram("mcp_rpc_duration_seconds", "JSON-RPC method latency by method and outcome")
+metrics.histogram("mcp_tool_duration_seconds", "Tool call latency by tool and outcome")
+metrics.histogram("mcp_client_request_duration_seconds", "MCP request latency by client name and outcome")
+metrics.histogram("nws_upstream_duration_seconds", "NWS API call latency (including retries) by endpoint and outcome")
+metrics.counter("nws_upstream_rejected_total", "NWS calls refused before reaching upstream, by endpoint and reason")
+metrics.gauge("mcp_rpc_in_flight", "JSON-RPC requests currently executing, by method")
+
+# Caching
+class TTLCache:
+    """Bounded in-process LRU cache with per-entry time-to-live.
+
+    Not thread-safe; it is only touched from the event loop.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def items(self) -> list[tuple[Any, float, Any]]:
+        """(key, monotonic expiry, value) for all entries, least recently used first."""
+        return [(key, expires_at, value) for key, (expires_at, value) in self._data.items()]
+
+    def clear(self):
+        self._data.clear()
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+class CacheEntry:
+    """A cached upstream payload with its HTTP freshness information."""
+    __slots__ = ("value", "expires_at", "stale_until", "etag", "last_modified")
+
+    def __init__(
+        self,
+        value: Any,
+        expires_at: float,
+        stale_until: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Validators to send upstream so an unchanged payload comes back as 304."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class ResponseCache:
+    """LRU cache of parsed upstream responses keyed by URL.
+
+    Freshness comes from the upstream Cache-Control / Expires headers rather
+    than a fixed TTL. Expired entries are kept until evicted so they can still
+    be served within the stale-while-revalidate window.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.revalidations = 0
+        self.not_modified = 0
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for a key regardless of freshness, or None."""
+        entry = self._data.get(key)
+        if entry is not None:
+            self._data.move_to_end(key)
+        return entry
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        stale_ttl: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> CacheEntry:
+        """Store a payload that is fresh for ttl seconds and servable stale for stale_ttl more."""
+        expires_at = time.monotonic() + ttl
+        entry = CacheEntry(value, expires_at, expires_at + stale_ttl, etag, last_modified)
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def refresh(self, entry: CacheEntry, ttl: float, stale_ttl: float):
+        """Extend an entry's freshness after upstream confirmed it is unchanged (304)."""
+        entry.expires_at = time.monotonic() + ttl
+        entry.stale_until = entry.expires_at + stale_ttl
+        self.not_modified += 1
+
+    def items(self) -> list[tuple[str, CacheEntry]]:
+        """All entries, least recently used first."""
+        return list(self._data.items())
+
+    def clear(self):
+        self._data.clear()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+            "revalidations": self.revalidations,
+            "not_modified": self.not_modified
+        }
+
+def parse_cache_headers(headers: httpx.Headers) -> Optional[tuple[float, float]]:
+    """Derive (ttl, stale_ttl) from Cache-Control / Expires headers.
+
+    Returns None when the response must not be stored.
+    """
+    directives: Dict[str, Optional[str]] = {}
+    for part in headers.get("cache-control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('" ') or None
+    
+    if "no-store" in directives or "private" in directives:
+        return None
+    
+    ttl: Optional[float] = None
+    if "no-cache" in directives:
+        ttl = 0.0
+    else:
+        for directive in ("s-maxage", "max-age"):
+            try:
+                ttl = float(directives[directive])
+                break
+            except (KeyError, TypeError, ValueError):
+                continue
+        if ttl is not None:
+            try:
+                ttl -= float(headers.get("age", "0"))
+            except ValueError:
+                pass
+        elif headers.get("expires"):
+            try:
+                expires = parsedate_to_datetime(headers["expires"])
+                date = parsedate_to_datetime(headers["date"]) if headers.get("date") else datetime.now(timezone.utc)
+                ttl = (expires - date).total_seconds()
+            except (TypeError, ValueError):
+                ttl = 0.0  # Invalid Expires means "already expired"
+    
+    if ttl is None:
+        ttl = RESPONSE_CACHE_DEFAULT_TTL
+    ttl = min(max(ttl, 0.0), RESPONSE_CACHE_MAX_TTL)
+    
+    try:
+        stale_ttl = float(directives["stale-while-revalidate"])
+    except (KeyError, TypeError, ValueError):
+        # no-cache means "revalidate before every use", so only an explicit window allows serving stale
+        stale_ttl = 0.0 if "no-cache" in directives else RESPONSE_CACHE_STALE_WHILE_REVALIDATE
+    return ttl, stale_ttl
+
+class SQLiteCacheBackend:
+    """Shared cache entries in a local SQLite file (WAL mode).
+
+    Every call runs in a worker thread with its own short-lived connection, the
+    same way the shared rate limiter does. Expired rows are skipped on read and
+    pruned every few hundred writes.
+    """
+
+    kind = "sqlite"
+    PRUNE_EVERY = 500
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db_ready = False
+        self._writes = 0
+
+    def _connect(self):
+        import sqlite3
+        conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+        if not self._db_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS shared_cache (key TEXT PRIMARY KEY, value BLOB, expires REAL)")
+            self._db_ready = True
+        return conn
+
+    def _get(self, key: str) -> Optional[bytes]:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM shared_cache WHERE key = ? AND expires > ?", (key, time.time())).fetchone()
+            return None if row is None else bytes(row[0])
+        finally:
+            conn.close()
+
+    def _set(self, key: str, value: bytes, ttl: float):
+        conn = self._connect()
+        try:
+            now = time.time()
+            conn.execute("INSERT OR REPLACE INTO shared_cache (key, value, expires) VALUES (?, ?, ?)", (key, value, now + ttl))
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                conn.execute("DELETE FROM shared_cache WHERE expires <= ?", (now,))
+        finally:
+            conn.close()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def close(self):
+        pass
+
+class RedisCacheBackend:
+    """Shared cache entries in a Redis-compatible server (Redis, Valkey, KeyDB, ...).
+
+    Values are plain strings with a server-side expiry, so a small local server
+    on each host is enough to share entries between its workers.
+    """
+
+    kind = "redis"
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self._client.set(key, value, px=max(1, int(ttl * 1000)))
+
+    async def close(self):
+        close = getattr(self._client, "aclose", None) or self._client.close
+        await close()
+
+class SharedCache:
+    """Second-tier cache shared between workers, behind the in-process caches.
+
+    A stored value is a one-line JSON header (wall-clock expiry plus metadata)
+    followed by the raw upstream body, so a hit costs the same single JSON
+    decode as an upstream response and nothing is pickled. Expiry is wall-clock
+    because monotonic clocks are not comparable across processes. Backend
+    errors and timeouts count as misses; the shared cache never fails a request.
+    """
+
+    def __init__(self, spec: str, prefix: str, timeout: float):
+        kind, _, path = spec.partition(":")
+        self.backend: Optional[Any] = None
+        if kind == "sqlite" and path:
+            self.backend = SQLiteCacheBackend(path)
+        elif kind in ("redis", "rediss", "unix"):
+            try:
+                self.backend = RedisCacheBackend(spec)
+            except ImportError:
+                logger.warning("⚠️  CACHE_L2_BACKEND is a Redis URL but the 'redis' package is not installed - shared cache disabled")
+        elif kind != "none":
+            raise ValueError(f"Invalid CACHE_L2_BACKEND '{spec}' - use none, sqlite:<path> or redis://host:port/db")
+        self.prefix = prefix
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def get(self, key: str) -> Optional[tuple[Dict[str, Any], bytes]]:
+        """Return (header, body) for a key that has not expired, or None."""
+        try:
+            raw = await asyncio.wait_for(self.backend.get(self.prefix + key), self.timeout)
+            if raw is not None:
+                header, _, body = raw.partition(b"\n")
+                meta = decode_json(header)
+                if meta.get("expires", 0) > time.time():
+                    self.hits += 1
+                    return meta, body
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Shared cache read of {key} failed: {e!r}")
+            return None
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, body: bytes, ttl: float, **meta: Any):
+        """Store a body for ttl seconds along with JSON-serializable metadata."""
+        if ttl <= 0:
+            return
+        header = encode_json({"expires": time.time() + ttl, **meta})
+        try:
+            await asyncio.wait_for(self.backend.set(self.prefix + key, header + b"\n" + body, ttl), self.timeout)
+            self.writes += 1
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Shared cache write of {key} failed: {e!r}")
+
+    async def close(self):
+        if self.backend is not None:
+            await self.backend.close()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.kind if self.backend is not None else "none",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "writes": self.writes,
+            "errors": self.errors
+        }
+
+shared_cache = SharedCache(CACHE_L2_BACKEND, CACHE_L2_PREFIX, CACHE_L2_TIMEOUT)
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key onto one shared task.
+
+    The first caller for a key starts the work; callers that arrive while it is
+    still running await the same result instead of repeating the work. The
+    shared task is shielded so one caller disconnecting does not cancel it for
+    everyone else.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.executed += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # Mark as retrieved even if every waiter went away
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._calls),
+            "executed": self.executed,
+            "coalesced": self.coalesced
+        }
+
+class HotKeyTracker:
+    """Exponentially decayed request counts used to find the most popular keys.
+
+    Only a bounded number of keys is tracked; when full, the coldest ones are
+    dropped. Scores decay on every call to decay() so the hot set follows
+    current traffic rather than all-time totals.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._scores: Dict[Hashable, float] = {}
+
+    def record(self, key: Hashable):
+        self._scores[key] = self._scores.get(key, 0.0) + 1.0
+        if len(self._scores) > self.maxsize:
+            # Prune the coldest half in one pass rather than one key per insert
+            for cold, _ in sorted(self._scores.items(), key=lambda item: item[1])[:len(self._scores) // 2]:
+                del self._scores[cold]
+
+    def score(self, key: Hashable) -> float:
+        return self._scores.get(key, 0.0)
+
+    def seed(self, key: Hashable, score: float):
+        """Raise a key's score to at least score (used when restoring a snapshot)."""
+        if score > self._scores.get(key, 0.0):
+            self._scores[key] = score
+
+    def decay(self, factor: float, floor: float = 0.1):
+        self._scores = {key: score * factor for key, score in self._scores.items() if score * factor >= floor}
+
+    def top(self, n: int, min_score: float = 0.0) -> list[Hashable]:
+        """The n highest-scoring keys with at least min_score, hottest first."""
+        ranked = sorted(self._scores.items(), key=lambda item: item[1], reverse=True)
+        return [key for key, score in ranked[:n] if score >= min_score]
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+# Coordinate -> gridpoint forecast URL; this mapping almost never changes
+points_cache = TTLCache(maxsize=POINTS_CACHE_MAXSIZE, ttl=POINTS_CACHE_TTL)
+
+def round_coordinates(latitude: float, longitude: float) -> tuple[float, float]:
+    """Round coordinates to the precision the NWS /points endpoint accepts."""
+    return (
+        round(float(latitude), POINTS_COORDINATE_PRECISION),
+        round(float(longitude), POINTS_COORDINATE_PRECISION)
+    )
+
+# Upstream Protection
+class UpstreamUnavailable(Exception):
+    """The NWS API cannot be called right now; retry_after is a hint in seconds."""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class UpstreamOverloaded(UpstreamUnavailable):
+    """Shed by the bulkhead because upstream capacity is exhausted."""
+
+class CircuitOpen(UpstreamUnavailable):
+    """Rejected because the circuit breaker for this NWS endpoint is open."""
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one NWS endpoint.
+
+    After failure_threshold consecutive upstream failures the circuit opens
+    and calls fail fast for recovery_time seconds; then a single probe call is
+    let through (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, recovery_time: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self.opened = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now (claims the probe when half-open)."""
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.recovery_time:
+                self.rejected += 1
+                return False
+            self.state = "half_open"
+        if self._probing:
+            self.rejected += 1
+            return False
+        self._probing = True
+        return True
+
+    def retry_after(self) -> float:
+        return max(1.0, self.recovery_time - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        self._probing = False
+        self.consecutive_failures = 0
+        if self.state != "closed":
+            logger.info(f"🔌 NWS circuit '{self.name}' closed")
+        self.state = "closed"
+
+    def record_failure(self):
+        self._probing = False
+        self.consecutive_failures += 1
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.opened += 1
+                logger.warning(f"🔌 NWS circuit '{self.name}' opened after {self.consecutive_failures} consecutive failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """Give back a half-open probe that never reached upstream."""
+        self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+            "rejected": self.rejected
+        }
+
+def nws_endpoint(url: str) -> str:
+    """Classify an NWS URL by endpoint family (alerts, points, gridpoints, ...)."""
+    path = httpx.URL(url).path
+    return path.strip("/").split("/", 1)[0] or "root"
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given as seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+class Bulkhead:
+    """Bounded concurrency plus a bounded wait queue around upstream calls.
+
+    Callers beyond max_concurrent queue for a slot; when the queue is full, or
+    the expected wait (queue depth x recent call duration) already exceeds the
+    queue_timeout latency budget, they are shed immediately instead of piling
+    up behind slow upstream calls.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.active = 0
+        self.waiting = 0
+        self.service_time = 0.0  # EWMA of seconds a slot is held
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.shed = 0
+        self.timeouts = 0
+
+    def expected_wait(self) -> float:
+        """Estimated queueing delay for a caller arriving now."""
+        if self.active < self.max_concurrent:
+            return 0.0
+        return (self.waiting + 1) / self.max_concurrent * self.service_time
+
+    @asynccontextmanager
+    async def slot(self):
+        if self.active >= self.max_concurrent or self.waiting:
+            if self.waiting >= self.max_queue:
+                self.rejected_queue_full += 1
+                raise UpstreamOverloaded("Weather service is overloaded (queue full), try again shortly", self.queue_timeout)
+            if self.expected_wait() > self.queue_timeout:
+                self.shed += 1
+                raise UpstreamOverloaded("Weather service is overloaded, try again shortly", self.expected_wait())
+        if self._semaphore.locked():
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise UpstreamOverloaded("Weather service is overloaded (queue wait exceeded), try again shortly", self.queue_timeout)
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()  # Free slot: returns without suspending
+        self.active += 1
+        self.admitted += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+            self.service_time += 0.2 * ((time.monotonic() - started) - self.service_time)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout,
+            "active": self.active,
+            "waiting": self.waiting,
+            "service_time_ewma": round(self.service_time, 4),
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "shed": self.shed,
+            "timeouts": self.timeouts
+        }
+
 # Weather API Helper Functions
+class NWSClient:
+    """Long-lived, pooled HTTP client for all NWS API traffic.
+
+    The underlying httpx.AsyncClient is created once in the app lifespan and
+    reused, so upstream calls share keep-alive connections instead of paying a
+    new TCP + TLS handshake per request.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self.cache = ResponseCache(maxsize=RESPONSE_CACHE_MAXSIZE)
+        self.max_stale = RESPONSE_CACHE_MAX_STALE
+        self._revalidation_tasks: Dict[str, asyncio.Task] = {}
+        self.inflight = SingleFlight()
+        self.bulkhead = Bulkhead(NWS_MAX_CONCURRENCY, NWS_MAX_QUEUE, NWS_QUEUE_TIMEOUT)
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.hot_keys = HotKeyTracker(maxsize=max(CACHE_REFRESH_HOT_KEYS * 20, 1000))
+        self.http2 = False
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.pool_timeouts = 0
+
+    async def start(self):
+        """Create the shared upstream client (idempotent)."""
+        if self._client is not None:
+            return
+        http2 = NWS_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("⚠️  NWS_HTTP2 is enabled but the 'h2' package is not installed - falling back to HTTP/1.1")
+                http2 = False
+        self.http2 = http2
+        self._client = httpx.AsyncClient(
+            headers={
+                "User-Agent": USER_AGENT,
+                "Accept": "application/geo+json"
+            },
+            limits=httpx.Limits(
+                max_connections=NWS_MAX_CONNECTIONS,
+                max_keepalive_connections=NWS_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=NWS_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(
+                connect=NWS_CONNECT_TIMEOUT,
+                read=NWS_READ_TIMEOUT,
+                write=NWS_WRITE_TIMEOUT,
+                pool=NWS_POOL_TIMEOUT
+            ),
+            http2=http2
+        )
+        logger.info(
+            f"🌐 NWS client started (max_connections={NWS_MAX_CONNECTIONS}, "
+            f"keepalive={NWS_MAX_KEEPALIVE_CONNECTIONS}, http2={http2})"
+        )
+
+    async def close(self):
+        """Close the shared upstream client and its connection pool."""
+        for task in list(self._revalidation_tasks.values()):
+            task.cancel()
+        self._revalidation_tasks.clear()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("🌐 NWS client closed")
+
+    async def get_json(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the parsed JSON body for an NWS URL, or None on error.
+
+        Fresh cached payloads are returned directly. Within the
+        stale-while-revalidate window the stale payload is returned at once
+        and refreshed in the background. When the upstream fails, a cached
+        copy up to max_stale seconds past expiry is served instead. Raises
+        UpstreamUnavailable when the upstream cannot be called and no such
+        copy exists.
+        """
+        self.hot_keys.record(url)
+        entry = self.cache.get_entry(url)
+        if entry is not None:
+            now = time.monotonic()
+            if now < entry.expires_at:
+                self.cache.hits += 1
+                return entry.value
+            if now < entry.stale_until:
+                self.cache.stale_hits += 1
+                self._schedule_revalidation(url)
+                return entry.value
+        self.cache.misses += 1
+        try:
+            with tracer.span("nws.fetch", url=url):
+                data = await self.inflight.do(url, lambda: self._fetch(url))
+        except UpstreamUnavailable:
+            if not self.servable(entry):
+                raise
+            data = None
+        if data is None and self.servable(entry):
+            # A recently expired copy beats failing outright
+            self.cache.stale_hits += 1
+            return entry.value
+        return data
+
+    def servable(self, entry: Optional[CacheEntry]) -> bool:
+        """Whether a cached entry is recent enough to serve when the upstream fails."""
+        return entry is not None and time.monotonic() - entry.expires_at <= self.max_stale
+
+    async def refresh(self, url: str) -> Optional[Dict[str, Any]]:
+        """Fetch a URL into the cache now, sharing any request already in flight for it."""
+        return await self.inflight.do(url, lambda: self._fetch(url))
+
+    def _schedule_revalidation(self, url: str):
+        """Refresh a stale cache entry in the background (one task per URL)."""
+        if url in self._revalidation_tasks:
+            return
+        self.cache.revalidations += 1
+        task = asyncio.create_task(self.inflight.do(url, lambda: self._fetch(url)))
+        self._revalidation_tasks[url] = task
+        task.add_done_callback(lambda t: self._revalidation_done(url, t))
+
+    def _revalidation_done(self, url: str, task: asyncio.Task):
+        self._revalidation_tasks.pop(url, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background refresh of {url} failed: {task.exception()}")
+
+    async def _fetch(self, url: str) -> Optional[Dict[str, Any]]:
+        """Fetch a URL from upstream and store the payload according to its cache headers.
+
+        When an expired entry is still cached its ETag / Last-Modified
+        validators are sent, and a 304 reply just refreshes that entry.
+        """
+        entry = self.cache.get_entry(url)
+        if shared_cache.enabled:
+            data = await self._fetch_shared(url, entry)
+            if data is not None:
+                return data
+        headers = entry.conditional_headers() if entry is not None else None
+        response = await self._request(url, headers=headers)
+        if response is None:
+            return None
+        if response.status_code == 304:
+            if entry is None:
+                return None
+            freshness = parse_cache_headers(response.headers)
+            if freshness is not None:
+                self.cache.refresh(entry, *freshness)
+                if shared_cache.enabled:
+                    await self._share(url, encode_json(entry.value), *freshness, entry.etag, entry.last_modified)
+            return entry.value
+        try:
+            with tracer.span("json.decode", bytes=len(response.content)):
+                data = decode_json(response.content)
+        except JSON_DECODE_ERRORS as e:
+            self.failures += 1
+            logger.error(f"NWS API returned invalid JSON: {e}")
+            return None
+        freshness = parse_cache_headers(response.headers)
+        if freshness is not None:
+            self.cache.set(
+                url,
+                data,
+                *freshness,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified")
+            )
+            if shared_cache.enabled:
+                await self._share(
+                    url,
+                    response.content,
+                    *freshness,
+                    response.headers.get("etag"),
+                    response.headers.get("last-modified")
+                )
+        return data
+
+    async def _fetch_shared(self, url: str, entry: Optional[CacheEntry]) -> Optional[Dict[str, Any]]:
+        """Adopt a copy another worker stored in the shared cache if it is fresher than ours."""
+        record = await shared_cache.get(url)
+        if record is None:
+            return None
+        meta, body = record
+        ttl = meta["expires"] - time.time()
+        if entry is not None and time.monotonic() + ttl <= entry.expires_at:
+            return None
+        try:
+            with tracer.span("json.decode", bytes=len(body)):
+                data = decode_json(body)
+        except JSON_DECODE_ERRORS:
+            return None
+        self.cache.set(url, data, ttl, meta.get("stale_ttl", 0.0), etag=meta.get("etag"), last_modified=meta.get("last_modified"))
+        return data
+
+    async def _share(self, url: str, body: bytes, ttl: float, stale_ttl: float, etag: Optional[str], last_modified: Optional[str]):
+        await shared_cache.set(url, body, ttl, stale_ttl=stale_ttl, etag=etag, last_modified=last_modified)
+
+    async def _request(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[httpx.Response]:
+        """Perform the upstream GET, returning the successful (or 304) response or None on error.
+
+        Raises CircuitOpen while the endpoint's breaker is open and
+        UpstreamOverloaded when the bulkhead sheds the call.
+        """
+        if self._client is None:
+            await self.start()
+        endpoint = nws_endpoint(url)
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            breaker = self.breakers[endpoint] = CircuitBreaker(endpoint, NWS_BREAKER_FAILURE_THRESHOLD, NWS_BREAKER_RECOVERY_TIME)
+        if not breaker.allow():
+            metrics.inc("nws_upstream_rejected_total", (("endpoint", endpoint), ("reason", "circuit_open")))
+            raise CircuitOpen(f"Weather service is unavailable ({endpoint}), try again shortly", breaker.retry_after())
+        
+        try:
+            async with self.bulkhead.slot():
+                started = time.perf_counter()
+                with tracer.span("nws.http", endpoint=endpoint) as span:
+                    response, upstream_failed = await self._send(url, headers)
+                    if response is not None:
+                        span.set_attribute("http.status_code", response.status_code)
+                metrics.observe(
+                    "nws_upstream_duration_seconds",
+                    (("endpoint", endpoint), ("outcome", "error" if upstream_failed else "ok")),
+                    time.perf_counter() - started
+                )
+        except UpstreamOverloaded:
+            metrics.inc("nws_upstream_rejected_total", (("endpoint", endpoint), ("reason", "shed")))
+            breaker.release_probe()
+            raise
+        except BaseException:
+            breaker.release_probe()
+            raise
+        if upstream_failed:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for a retry attempt."""
+        return random.uniform(0, min(NWS_RETRY_BACKOFF_MAX, NWS_RETRY_BACKOFF_BASE * (2 ** attempt)))
+
+    async def _send(self, url: str, headers: Optional[Dict[str, str]]) -> tuple[Optional[httpx.Response], bool]:
+        """GET with bounded retries on 5xx/429 and connect errors.
+
+        Returns (response or None, whether the failure counts against upstream health).
+        """
+        attempt = 0
+        while True:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                response = await self._client.get(url, headers=headers)
+            except httpx.PoolTimeout as e:
+                # Local pool saturation says nothing about upstream health
+                self.pool_timeouts += 1
+                self.failures += 1
+                logger.error(f"NWS API request failed (connection pool exhausted): {e}")
+                return None, False
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                error = str(e) or type(e).__name__
+                delay = self._backoff(attempt)
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"NWS API request failed: {e}")
+                return None, True
+            else:
+                if response.is_success or (response.status_code == 304 and headers):
+                    return response, False
+                if response.status_code != 429 and response.status_code < 500:
+                    self.failures += 1
+                    logger.error(f"NWS API request failed: {response.status_code} for {url}")
+                    return None, False
+                error = f"{response.status_code} for {url}"
+                retry_after = parse_retry_after(response.headers.get("retry-after"))
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+            finally:
+                self.in_flight -= 1
+            
+            if attempt >= NWS_RETRY_ATTEMPTS or delay > NWS_RETRY_BACKOFF_MAX:
+                self.failures += 1
+                logger.error(f"NWS API request failed after {attempt + 1} attempt(s): {error}")
+                return None, True
+            attempt += 1
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return connection pool and request statistics for sizing the pool."""
+        open_connections = None
+        idle_connections = None
+        # httpx does not expose pool state publicly; read it best-effort from the transport
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is not None:
+            open_connections = len(connections)
+            idle_connections = sum(1 for c in connections if c.is_idle())
+        return {
+            "started": self._client is not None,
+            "http2": self.http2,
+            "max_connections": NWS_MAX_CONNECTIONS,
+            "max_keepalive_connections": NWS_MAX_KEEPALIVE_CONNECTIONS,
+            "keepalive_expiry": NWS_KEEPALIVE_EXPIRY,
+            "open_connections": open_connections,
+            "idle_connections": idle_connections,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "pool_utilization": round(self.in_flight / NWS_MAX_CONNECTIONS, 3),
+            "requests": self.requests,
+            "failures": self.failures,
+            "retries": self.retries,
+            "pool_timeouts": self.pool_timeouts,
+            "bulkhead": self.bulkhead.stats(),
+            "circuit_breakers": {name: breaker.stats() for name, breaker in self.breakers.items()}
+        }
+
+nws_client = NWSClient()
+
+class CacheRefresher:
+    """Background task that keeps the most requested NWS responses warm.
+
+    Every interval it takes the hottest URLs seen by the client and re-fetches
+    those whose cached copy expires before the next cycle (plus a lead time),
+    so user requests hit a fresh entry instead of waiting on upstream.
+    Refreshes are capped at budget upstream calls per minute, and URLs that
+    were never cacheable (no cache entry) are skipped.
+    """
+
+    def __init__(self, client: NWSClient, interval: float, hot_keys: int, min_hits: float, lead_time: float, budget: int):
+        self.client = client
+        self.interval = interval
+        self.hot_keys = hot_keys
+        self.min_hits = min_hits
+        self.lead_time = lead_time
+        self.budget = budget
+        self._window_start = time.monotonic()
+        self._window_used = 0
+        self.cycles = 0
+        self.refreshed = 0
+        self.failed = 0
+        self.over_budget = 0
+
+    def due(self) -> list[str]:
+        """Hot URLs whose cached copy will expire before the next cycle, hottest first."""
+        deadline = time.monotonic() + self.interval + self.lead_time
+        urls = []
+        for url in self.client.hot_keys.top(self.hot_keys, self.min_hits):
+            entry = self.client.cache.get_entry(url)
+            if entry is not None and entry.expires_at <= deadline:
+                urls.append(url)
+        return urls
+
+    def _take_budget(self, wanted: int) -> int:
+        now = time.monotonic()
+        if now - self._window_start >= 60:
+            self._window_start = now
+            self._window_used = 0
+        granted = max(0, min(wanted, self.budget - self._window_used))
+        self._window_used += granted
+        return granted
+
+    async def refresh_once(self) -> int:
+        """Run one refresh cycle and return how many URLs were refreshed."""
+        self.cycles += 1
+        self.client.hot_keys.decay(CACHE_REFRESH_DECAY)
+        urls = self.due()
+        granted = self._take_budget(len(urls))
+        self.over_budget += len(urls) - granted
+        if not granted:
+            return 0
+        results = await asyncio.gather(*(self.client.refresh(url) for url in urls[:granted]), return_exceptions=True)
+        refreshed = sum(1 for result in results if result is not None and not isinstance(result, BaseException))
+        self.refreshed += refreshed
+        self.failed += granted - refreshed
+        return refreshed
+
+    async def run(self):
+        """Refresh hot entries every interval (runs until cancelled)."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh_once()
+            except Exception as e:
+                logger.error(f"Cache refresh cycle failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": CACHE_REFRESH_ENABLED,
+            "interval": self.interval,
+            "hot_keys": self.hot_keys,
+            "tracked_keys": len(self.client.hot_keys),
+            "budget_per_minute": self.budget,
+            "cycles": self.cycles,
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+            "over_budget": self.over_budget
+        }
+
+cache_refresher = CacheRefresher(
+    nws_client,
+    interval=CACHE_REFRESH_INTERVAL,
+    hot_keys=CACHE_REFRESH_HOT_KEYS,
+    min_hits=CACHE_REFRESH_MIN_HITS,
+    lead_time=CACHE_REFRESH_LEAD_TIME,
+    budget=CACHE_REFRESH_BUDGET
+)
+
+class CacheSnapshot:
+    """Saves hot cache entries to disk and restores them after a restart.
+
+    The snapshot holds the most recently used NWS responses (with their
+    validators and popularity scores) and every live /points lookup. Expiry
+    times are stored as wall-clock timestamps, since monotonic time restarts
+    with the process. Entries past their stale window are kept only if they
+    carry an ETag / Last-Modified, so the first request after a restart can
+    still revalidate with a cheap 304, and never once they are more than
+    the client's max_stale past expiry. Loading runs in the background and
+    never replaces an entry already fetched by a live request.
+    """
+
+    VERSION = 1
+
+    def __init__(self, client: NWSClient, points: TTLCache, path: str, interval: float, max_entries: int):
+        self.client = client
+        self.points = points
+        self.path = path
+        self.interval = interval
+        self.max_entries = max_entries
+        self.saves = 0
+        self.save_errors = 0
+        self.saved_entries = 0
+        self.last_save_seconds: Optional[float] = None
+        self.restored_responses = 0
+        self.restored_points = 0
+        self.load_error: Optional[str] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def collect(self) -> Dict[str, Any]:
+        """Build the snapshot document from the live caches."""
+        to_wall = time.time() - time.monotonic()
+        now = time.monotonic()
+        responses = []
+        # Slice from an explicit start: [-0:] would select everything
+        entries = self.client.cache.items()
+        for url, entry in entries[max(0, len(entries) - self.max_entries):]:
+            if entry.stale_until <= now and not (entry.etag or entry.last_modified):
+                continue
+            if now - entry.expires_at > self.client.max_stale:
+                continue
+            responses.append({
+                "url": url,
+                "expires": entry.expires_at + to_wall,
+                "stale_until": entry.stale_until + to_wall,
+                "etag": entry.etag,
+                "last_modified": entry.last_modified,
+                "score": self.client.hot_keys.score(url),
+                "value": entry.value
+            })
+        points = [
+            [key[0], key[1], value, expires_at + to_wall]
+            for key, expires_at, value in self.points.items()
+            if expires_at > now
+        ]
+        return {"version": self.VERSION, "created": time.time(), "responses": responses, "points": points}
+
+    def _write(self, document: Dict[str, Any]):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # Write to a per-process temp file and rename, so readers (and other workers) never see a partial file
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(encode_json(document))
+        os.replace(temp_path, self.path)
+
+    async def save(self) -> int:
+        """Write the snapshot file; returns the number of entries saved."""
+        started = time.perf_counter()
+        document = self.collect()
+        try:
+            await asyncio.to_thread(self._write, document)
+        except OSError as e:
+            self.save_errors += 1
+            logger.error(f"Failed to write cache snapshot {self.path}: {e}")
+            return 0
+        self.saves += 1
+        self.saved_entries = len(document["responses"]) + len(document["points"])
+        self.last_save_seconds = round(time.perf_counter() - started, 4)
+        return self.saved_entries
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, "rb") as f:
+                return decode_json(f.read())
+        except FileNotFoundError:
+            return None
+
+    async def load(self):
+        """Restore entries from the snapshot file, skipping keys that are already cached."""
+        try:
+            document = await asyncio.to_thread(self._read)
+        except (OSError, *JSON_DECODE_ERRORS) as e:
+            self.load_error = str(e)
+            logger.warning(f"⚠️  Ignoring unreadable cache snapshot {self.path}: {e}")
+            return
+        if not document:
+            return
+        if not isinstance(document, dict) or document.get("version") != self.VERSION:
+            self.load_error = "unsupported snapshot format"
+            logger.warning(f"⚠️  Ignoring cache snapshot {self.path}: {self.load_error}")
+            return
+        now = time.time()
+        skipped = 0
+        responses = document.get("responses")
+        for item in responses if isinstance(responses, list) else []:
+            try:
+                url = item["url"]
+                if url in self.client.cache:
+                    continue
+                expires = float(item["expires"])
+                stale_ttl = float(item["stale_until"]) - expires
+                if now - expires > self.client.max_stale:
+                    continue
+                score = float(item.get("score") or 0.0)
+                self.client.cache.set(
+                    url,
+                    item["value"],
+                    ttl=expires - now,
+                    stale_ttl=stale_ttl,
+                    etag=item.get("etag"),
+                    last_modified=item.get("last_modified")
+                )
+            except (KeyError, TypeError, ValueError, AttributeError):
+                skipped += 1
+                continue
+            self.client.hot_keys.seed(url, score)
+            self.restored_responses += 1
+        points = document.get("points")
+        for item in points if isinstance(points, list) else []:
+            try:
+                latitude, longitude, forecast_url, expires = item
+                key = (float(latitude), float(longitude))
+                ttl = float(expires) - now
+                if ttl <= 0 or key in self.points or not isinstance(forecast_url, str):
+                    continue
+            except (TypeError, ValueError):
+                skipped += 1
+                continue
+            self.points.set(key, forecast_url, ttl=ttl)
+            self.restored_points += 1
+        if skipped:
+            self.load_error = f"skipped {skipped} malformed entries"
+            logger.warning(f"⚠️  Skipped {skipped} malformed entries in cache snapshot {self.path}")
+        created = document.get("created")
+        age = now - created if isinstance(created, (int, float)) else 0.0
+        logger.info(
+            f"♻️  Restored {self.restored_responses} NWS responses and {self.restored_points} points lookups "
+            f"from {self.path} (snapshot age {age:.0f}s)"
+        )
+
+    async def run(self):
+        """Save a snapshot every interval (runs until cancelled)."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.save()
+            except Exception as e:
+                logger.error(f"Cache snapshot failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path or None,
+            "interval": self.interval,
+            "saves": self.saves,
+            "save_errors": self.save_errors,
+            "saved_entries": self.saved_entries,
+            "last_save_seconds": self.last_save_seconds,
+            "restored_responses": self.restored_responses,
+            "restored_points": self.restored_points,
+            "load_error": self.load_error
+        }
+
+cache_snapshot = CacheSnapshot(
+    nws_client,
+    points_cache,
+    path=CACHE_SNAPSHOT_PATH,
+    interval=CACHE_SNAPSHOT_INTERVAL,
+    max_entries=CACHE_SNAPSHOT_MAX_ENTRIES
+)
+
 async def make_nws_request(url: str) -> Optional[Dict[str, Any]]:
     """Make a request to the NWS API with proper error handling."""
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Accept": "application/geo+json"
-    }
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            logger.error(f"NWS API request failed: {e}")
+    return await nws_client.get_json(url)
+
+async def resolve_forecast_url(coordinates: tuple[float, float]) -> Optional[str]:
+    """Resolve rounded coordinates to their NWS gridpoint forecast URL, from cache when possible."""
+    forecast_url = points_cache.get(coordinates)
+    if forecast_url is None:
+        shared_key = f"points:{coordinates[0]},{coordinates[1]}"
+        record = await shared_cache.get(shared_key) if shared_cache.enabled else None
+        if record is not None:
+            meta, body = record
+            forecast_url = body.decode("utf-8")
+            points_cache.set(coordinates, forecast_url, ttl=min(POINTS_CACHE_TTL, meta["expires"] - time.time()))
+            return forecast_url
+        with tracer.span("nws.points"):
+            points_data = await make_nws_request(f"{NWS_API_BASE}/points/{coordinates[0]},{coordinates[1]}")
+        if not points_data:
             return None
+        
+        # Get the forecast URL from the points response
+        forecast_url = points_data["properties"]["forecast"]
+        points_cache.set(coordinates, forecast_url)
+        if shared_cache.enabled:
+            await shared_cache.set(shared_key, forecast_url.encode("utf-8"), POINTS_CACHE_TTL)
+    return forecast_url
 
 def format_alert(feature: Dict[str, Any]) -> str:
     """Format an alert feature into a readable string."""
@@ -163,32 +2181,560 @@ Description: {props.get('description', 'No description available')}
 Instructions: {props.get('instruction', 'No specific instructions provided')}
 """
 
+def format_forecast_period(period: Dict[str, Any]) -> str:
+    """Format a forecast period into a readable string."""
+    return f"""
+{period['name']}:
+Temperature: {period['temperature']}°{period['temperatureUnit']}
+Wind: {period['windSpeed']} {period['windDirection']}
+Forecast: {period['detailedForecast']}
+"""
+
+# Structured output: selectable fields and the long free-text fields subject to truncation
+ALERT_FIELDS = ("event", "areaDesc", "severity", "description", "instruction")
+FORECAST_FIELDS = ("name", "temperature", "temperatureUnit", "windSpeed", "windDirection", "detailedForecast")
+LONG_TEXT_FIELDS = ("description", "instruction", "detailedForecast")
+OUTPUT_FORMATS = ("text", "json")
+
+class RenderCache:
+    """LRU memo of renderings of upstream payload objects.
+
+    Entries are keyed by id() of the alert feature / forecast period plus the
+    render options, and keep a strong reference to the object so its id cannot
+    be reused while cached. A refetched payload is a new object, so each
+    upstream payload version is rendered once and then reused by every caller.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[tuple, tuple[Any, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, obj: Any, options: Hashable, render: Callable[[], Any]) -> Any:
+        key = (id(obj), options)
+        cached = self._data.get(key)
+        if cached is not None and cached[0] is obj:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        value = render()
+        self._data[key] = (obj, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None
+        }
+
+render_cache = RenderCache(maxsize=RENDER_CACHE_MAXSIZE)
+
+NWS_ZONE_PATTERN = re.compile(r"^[A-Z]{2}[CZ]\d{3}$")
+
+def parse_alert_targets(arguments: Dict[str, Any]) -> tuple[list[str], list[str]]:
+    """Validated, de-duplicated (areas, zones) from get_alerts' state / states / zones arguments.
+
+    Areas must be NWS area codes and zones NWS zone ids (e.g. TXZ211), since
+    both end up in the upstream URL path. Raises ValueError with a message
+    fit for the tool result.
+    """
+    state = arguments.get("state")
+    if state is not None and not isinstance(state, str):
+        raise ValueError("state must be a string")
+    candidates = {"states": [state] if state else [], "zones": []}
+    for name in ("states", "zones"):
+        values = arguments.get(name)
+        if values is None:
+            continue
+        if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+            raise ValueError(f"{name} must be a list of strings")
+        candidates[name] += values
+    
+    areas: list[str] = []
+    for area in candidates["states"]:
+        area = area.strip().upper()
+        if area not in NWS_AREA_CODES:
+            raise ValueError(f"Unknown state or area code '{area[:10]}'")
+        if area not in areas:
+            areas.append(area)
+    zones: list[str] = []
+    for zone in candidates["zones"]:
+        zone = zone.strip().upper()
+        if not NWS_ZONE_PATTERN.match(zone):
+            raise ValueError(f"Invalid zone '{zone[:10]}' - expected an NWS zone id such as TXZ211")
+        if zone not in zones:
+            zones.append(zone)
+    return areas, zones
+
+def parse_output_options(arguments: Dict[str, Any]) -> tuple[str, Optional[tuple[str, ...]], Optional[int], Optional[int]]:
+    """Validate the shared format / fields / limit / max_description_length tool arguments.
+
+    Raises ValueError with a user-facing message on bad input.
+    """
+    output_format = arguments.get("format", "text")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(OUTPUT_FORMATS)}")
+    
+    fields = arguments.get("fields")
+    if fields is not None:
+        if not isinstance(fields, list) or not fields or not all(isinstance(f, str) for f in fields):
+            raise ValueError("fields must be a non-empty list of field names")
+        fields = tuple(dict.fromkeys(fields))
+    
+    limits = []
+    for name in ("limit", "max_description_length"):
+        value = arguments.get(name)
+        if value is not None:
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                raise ValueError(f"{name} must be a positive integer")
+        limits.append(value)
+    return output_format, fields, limits[0], limits[1]
+
+def truncate_fields(record: Dict[str, Any], max_length: Optional[int]) -> Dict[str, Any]:
+    """Copy of record with long free-text fields cut to max_length characters."""
+    if max_length is None:
+        return record
+    truncated = dict(record)
+    for name in LONG_TEXT_FIELDS:
+        value = truncated.get(name)
+        if isinstance(value, str) and len(value) > max_length:
+            truncated[name] = value[:max_length].rstrip() + "…"
+    return truncated
+
+def select_fields(record: Dict[str, Any], fields: tuple[str, ...], max_length: Optional[int]) -> Dict[str, Any]:
+    return truncate_fields({name: record.get(name) for name in fields}, max_length)
+
+def render_alert(feature: Dict[str, Any], output_format: str, fields: Optional[tuple[str, ...]], max_length: Optional[int]) -> Any:
+    """Text or structured rendering of an alert feature, memoized per payload object."""
+    def render() -> Any:
+        props = feature.get("properties", {})
+        if output_format == "json":
+            record = select_fields(props, fields or ALERT_FIELDS, max_length)
+            return {"id": feature.get("id") or props.get("id"), **record}
+        if fields is None:
+            return format_alert({"properties": truncate_fields(props, max_length)})
+        selected = select_fields(props, fields, max_length)
+        return "\n" + "\n".join(f"{name}: {value}" for name, value in selected.items()) + "\n"
+    return render_cache.get_or_render(feature, ("alert", output_format, fields, max_length), render)
+
+def render_forecast_period(period: Dict[str, Any], output_format: str, fields: Optional[tuple[str, ...]], max_length: Optional[int]) -> Any:
+    """Text or structured rendering of a forecast period, memoized per payload object."""
+    def render() -> Any:
+        if output_format == "json":
+            return select_fields(period, fields or FORECAST_FIELDS, max_length)
+        if fields is None:
+            return format_forecast_period(truncate_fields(period, max_length))
+        selected = select_fields(period, fields, max_length)
+        return f"\n{period.get('name', 'Forecast')}:\n" + "\n".join(f"{name}: {value}" for name, value in selected.items()) + "\n"
+    return render_cache.get_or_render(period, ("period", output_format, fields, max_length), render)
+
+def structured_result(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Tool result carrying structuredContent plus its JSON text for clients that only read content."""
+    return {
+        "content": [
+            {
+                "type": "text",
+                "text": encode_json(data).decode("utf-8")
+            }
+        ],
+        "structuredContent": data
+    }
+
+# JSON-RPC 2.0 error codes
+JSONRPC_PARSE_ERROR = -32700
+JSONRPC_INVALID_REQUEST = -32600
+JSONRPC_METHOD_NOT_FOUND = -32601
+JSONRPC_INVALID_PARAMS = -32602
+JSONRPC_INTERNAL_ERROR = -32603
+JSONRPC_UPSTREAM_UNAVAILABLE = -32002
+JSONRPC_PERMISSION_DENIED = -32003
+
+# Receives progress updates ({"progress", "total", "message"}) from long-running tool calls
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+class RawJSON:
+    """An already-serialized JSON value, spliced into responses verbatim."""
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+def encode_jsonrpc(response: Dict[str, Any] | list) -> bytes:
+    """Serialize a JSON-RPC response (or batch), splicing in pre-serialized results."""
+    if isinstance(response, list):
+        return b"[" + b",".join(encode_jsonrpc(item) for item in response) + b"]"
+    result = response.get("result")
+    if isinstance(result, RawJSON):
+        return b'{"jsonrpc":"2.0","id":' + encode_json(response.get("id")) + b',"result":' + result.data + b"}"
+    return encode_json(response)
+
+def jsonrpc_error(request_id: Any, code: int, message: str, data: Any = None) -> Dict[str, Any]:
+    """Build a JSON-RPC 2.0 error response."""
+    error: Dict[str, Any] = {"code": code, "message": message}
+    if data is not None:
+        error["data"] = data
+    return {"jsonrpc": "2.0", "id": request_id, "error": error}
+
+# Sessions and Resource Subscriptions
+ALERTS_RESOURCE_PREFIX = "mcp://alerts/"
+
+# Area codes accepted by the NWS /alerts/active/area endpoint: states, territories and marine areas
+NWS_AREA_CODES = frozenset((
+    "AL", "AK", "AS", "AR", "AZ", "CA", "CO", "CT", "DE", "DC", "FL", "GA", "GU", "HI", "ID", "IL", "IN", "IA",
+    "KS", "KY", "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC",
+    "ND", "OH", "OK", "OR", "PA", "PR", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VI", "VA", "WA", "WV", "WI",
+    "WY", "MP", "PW", "FM", "MH",
+    "AM", "AN", "GM", "LC", "LE", "LH", "LM", "LO", "LS", "PH", "PK", "PM", "PS", "PZ", "SL"
+))
+
+def alerts_resource_area(uri: Any) -> Optional[str]:
+    """Area code from an mcp://alerts/{state} URI, or None if it is not a known NWS area."""
+    if not isinstance(uri, str) or not uri.startswith(ALERTS_RESOURCE_PREFIX):
+        return None
+    area = uri[len(ALERTS_RESOURCE_PREFIX):].strip().upper()
+    return area if area in NWS_AREA_CODES else None
+
+def alerts_version(data: Dict[str, Any]) -> frozenset:
+    """Identity of an alerts payload's contents: which alerts, and when each was sent."""
+    return frozenset(
+        (feature.get("id"), feature.get("properties", {}).get("sent"))
+        for feature in data.get("features", [])
+    )
+
+# Pushed into a session's queue when it is closed, so an open GET /mcp/stream ends
+SESSION_CLOSED = object()
+
+class MCPSession:
+    """A streamable HTTP session: its owner, subscriptions and pending server notifications."""
+
+    def __init__(self, session_id: str, key_id: str):
+        self.id = session_id
+        self.key_id = key_id
+        # Canonical resource URI -> the URI as the client spelled it (used in its notifications)
+        self.subscriptions: Dict[str, str] = {}
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=MCP_SESSION_QUEUE_SIZE)
+        self.last_seen = time.monotonic()
+        self.streams = 0
+        self.dropped = 0
+        self.closed = False
+
+    def push(self, message: Dict[str, Any]):
+        # Update notifications are idempotent, so a slow listener just misses duplicates
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def close(self):
+        self.closed = True
+        while True:
+            try:
+                self.queue.put_nowait(SESSION_CLOSED)
+                return
+            except asyncio.QueueFull:
+                self.queue.get_nowait()  # Pending notifications are moot once the session is gone
+
+class SessionManager:
+    """Sessions for the streamable HTTP transport and the pollers behind resource subscriptions.
+
+    initialize only hands out a session id, signed with the caller's key so it
+    can be checked without any stored state. A session is allocated the first
+    time it is needed, by resources/subscribe, resources/unsubscribe or
+    GET /mcp/stream, so plain handshakes never compete for session slots.
+    Each key may hold max_per_key sessions; when a key or the whole table is
+    full the least recently seen idle session is evicted. Idle sessions
+    without an open stream expire after ttl seconds, checked by run().
+
+    Each subscribed alerts feed has exactly one upstream poller, however many
+    sessions subscribe to it; when its contents change every subscriber gets a
+    notifications/resources/updated message on its GET /mcp/stream channel.
+    A poller stops when its last subscriber leaves.
+    """
+
+    def __init__(
+        self,
+        poll_interval: float,
+        ttl: float,
+        max_sessions: int,
+        max_per_key: int,
+        max_subscriptions: int,
+        max_subscriptions_per_key: int,
+        secret: str = ""
+    ):
+        self.poll_interval = poll_interval
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_per_key = max_per_key
+        self.max_subscriptions = max_subscriptions
+        self.max_subscriptions_per_key = max_subscriptions_per_key
+        self.sessions: Dict[str, MCPSession] = {}
+        # Canonical resource URI -> ids of subscribed sessions
+        self.subscribers: Dict[str, set[str]] = {}
+        self._pollers: Dict[str, asyncio.Task] = {}
+        self._secret = secret.encode("utf-8") if secret else secrets.token_bytes(32)
+        # Ids of closed, expired or evicted sessions -> when, so they are not silently revived
+        self._closed: "OrderedDict[str, float]" = OrderedDict()
+        self.issued = 0
+        self.evicted = 0
+        self.expired = 0
+        self.polls = 0
+        self.notifications = 0
+
+    def _sign(self, nonce: str, key_id: str) -> str:
+        return hmac.new(self._secret, f"{nonce}.{key_id}".encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+    def issue(self, auth: AuthInfo) -> str:
+        """A new session id for the caller; nothing is stored until the session is opened."""
+        nonce = secrets.token_urlsafe(18)
+        self.issued += 1
+        return f"{nonce}.{self._sign(nonce, auth.key_id)}"
+
+    def get(self, session_id: str, auth: AuthInfo) -> Optional[MCPSession]:
+        """The caller's open session, or None if the id is valid but not opened yet.
+
+        Unknown, foreign or closed ids are 404 per the transport spec.
+        """
+        session = self.sessions.get(session_id)
+        if session is not None:
+            if session.key_id != auth.key_id:
+                raise HTTPException(status_code=404, detail="Session not found")
+            session.last_seen = time.monotonic()
+            return session
+        nonce, _, signature = session_id.partition(".")
+        if session_id in self._closed or not hmac.compare_digest(signature, self._sign(nonce, auth.key_id)):
+            raise HTTPException(status_code=404, detail="Session not found")
+        return None
+
+    def open(self, session_id: str, auth: AuthInfo) -> MCPSession:
+        """The caller's session, allocating it on first use."""
+        session = self.get(session_id, auth)
+        if session is not None:
+            return session
+        owned = [s for s in self.sessions.values() if s.key_id == auth.key_id]
+        if self.max_per_key and len(owned) >= self.max_per_key and not self._evict_idle(owned):
+            raise HTTPException(status_code=429, detail="Too many open sessions for this API key", headers={"Retry-After": "60"})
+        if len(self.sessions) >= self.max_sessions and not self._evict_idle(self.sessions.values()):
+            raise HTTPException(status_code=503, detail="Too many active sessions", headers={"Retry-After": "60"})
+        session = MCPSession(session_id, auth.key_id)
+        self.sessions[session.id] = session
+        return session
+
+    def _evict_idle(self, candidates) -> bool:
+        """Close the least recently seen session without an open stream; False if there is none."""
+        idle = [s for s in candidates if s.streams == 0]
+        if not idle:
+            return False
+        self.close(min(idle, key=lambda s: s.last_seen).id)
+        self.evicted += 1
+        return True
+
+    def close(self, session_id: str):
+        self._closed[session_id] = time.monotonic()
+        self._closed.move_to_end(session_id)
+        while len(self._closed) > self.max_sessions * 10:
+            self._closed.popitem(last=False)
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            for uri in list(session.subscriptions):
+                self.unsubscribe(session, uri)
+            session.close()
+
+    def expire(self):
+        now = time.monotonic()
+        cutoff = now - self.ttl
+        for session in [s for s in self.sessions.values() if s.streams == 0 and s.last_seen < cutoff]:
+            self.close(session.id)
+            self.expired += 1
+        # Closed ids only need remembering while a client might still retry them
+        while self._closed and next(iter(self._closed.values())) < cutoff:
+            self._closed.popitem(last=False)
+
+    async def run(self):
+        """Expire idle sessions periodically (runs until cancelled)."""
+        while True:
+            await asyncio.sleep(max(1.0, min(60.0, self.ttl / 2)))
+            self.expire()
+
+    def subscribe(self, session: MCPSession, uri: str):
+        area = alerts_resource_area(uri)
+        canonical = ALERTS_RESOURCE_PREFIX + area if area is not None else uri
+        if canonical not in session.subscriptions:
+            if len(session.subscriptions) >= self.max_subscriptions:
+                raise HTTPException(status_code=400, detail=f"Subscription limit of {self.max_subscriptions} per session reached")
+            owned = sum(len(s.subscriptions) for s in self.sessions.values() if s.key_id == session.key_id)
+            if owned >= self.max_subscriptions_per_key:
+                raise HTTPException(status_code=400, detail=f"Subscription limit of {self.max_subscriptions_per_key} per API key reached")
+        session.subscriptions[canonical] = uri
+        self.subscribers.setdefault(canonical, set()).add(session.id)
+        if area is not None and canonical not in self._pollers:
+            self._pollers[canonical] = asyncio.create_task(self._poll(canonical, area))
+
+    def unsubscribe(self, session: MCPSession, uri: str):
+        area = alerts_resource_area(uri)
+        uri = ALERTS_RESOURCE_PREFIX + area if area is not None else uri
+        session.subscriptions.pop(uri, None)
+        subscribers = self.subscribers.get(uri)
+        if subscribers is not None:
+            subscribers.discard(session.id)
+            if not subscribers:
+                del self.subscribers[uri]
+                poller = self._pollers.pop(uri, None)
+                if poller is not None:
+                    poller.cancel()
+
+    def notify_updated(self, uri: str):
+        for session_id in self.subscribers.get(uri, ()):
+            session = self.sessions.get(session_id)
+            if session is not None:
+                session.push({
+                    "jsonrpc": "2.0",
+                    "method": "notifications/resources/updated",
+                    "params": {"uri": session.subscriptions.get(uri, uri)}
+                })
+                self.notifications += 1
+
+    def broadcast(self, message: Dict[str, Any]):
+        for session in self.sessions.values():
+            session.push(message)
+            self.notifications += 1
+
+    async def _poll(self, uri: str, area: str):
+        """Poll one alerts feed for all its subscribers (runs until cancelled)."""
+        url = f"{NWS_API_BASE}/alerts/active/area/{area}"
+        version = None
+        while True:
+            try:
+                data = await make_nws_request(url)
+            except UpstreamUnavailable:
+                data = None
+            except Exception as e:
+                logger.error(f"Subscription poll of {uri} failed: {e}")
+                data = None
+            self.polls += 1
+            if data and "features" in data:
+                current = alerts_version(data)
+                if version is not None and current != version:
+                    self.notify_updated(uri)
+                version = current
+            await asyncio.sleep(self.poll_interval)
+
+    async def shutdown(self):
+        for poller in self._pollers.values():
+            poller.cancel()
+        self._pollers.clear()
+        for session in self.sessions.values():
+            session.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self.sessions),
+            "issued": self.issued,
+            "evicted": self.evicted,
+            "expired": self.expired,
+            "streams": sum(session.streams for session in self.sessions.values()),
+            "subscriptions": {uri: len(ids) for uri, ids in self.subscribers.items()},
+            "pollers": len(self._pollers),
+            "polls": self.polls,
+            "notifications": self.notifications,
+            "dropped": sum(session.dropped for session in self.sessions.values())
+        }
+
+session_manager = SessionManager(
+    poll_interval=MCP_SUBSCRIPTION_POLL_INTERVAL,
+    ttl=MCP_SESSION_TTL,
+    max_sessions=MCP_MAX_SESSIONS,
+    max_per_key=MCP_MAX_SESSIONS_PER_KEY,
+    max_subscriptions=MCP_MAX_SUBSCRIPTIONS_PER_SESSION,
+    max_subscriptions_per_key=MCP_MAX_SUBSCRIPTIONS_PER_KEY,
+    secret=MCP_SESSION_SECRET
+)
+
 # MCP Server Class
 class MCPServer:
     def __init__(self):
         self.tools: Dict[str, Tool] = {}
         self.resources: Dict[str, Resource] = {}
+        # Bumped on every registry change; serialized lists are rebuilt lazily after it
+        self.registry_version = 0
+        self._tools_list_json: Optional[bytes] = None
+        self._resources_list_json: Optional[bytes] = None
+        self.tool_calls = SingleFlight()
+        self.tool_handlers: Dict[str, Callable[[Dict[str, Any], Optional[ProgressCallback]], Awaitable[Dict[str, Any]]]] = {
+            "get_alerts": self.tool_get_alerts,
+            "get_forecast": self.tool_get_forecast,
+            "get_forecast_batch": self.tool_get_forecast_batch,
+        }
         self.initialize_tools()
         self.initialize_resources()
+        self.initialize_methods()
     
     def initialize_tools(self):
         """Initialize available tools"""
+        # Output options shared by the weather tools
+        output_options = {
+            "format": {
+                "type": "string",
+                "enum": list(OUTPUT_FORMATS),
+                "description": "\"text\" (default) or \"json\" for structuredContent"
+            },
+            "fields": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Properties to include for each alert/period (e.g. [\"event\", \"severity\"])"
+            },
+            "max_description_length": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Truncate long description/instruction text to this many characters"
+            }
+        }
+        limit_option = {
+            "type": "integer",
+            "minimum": 1,
+            "description": "Maximum number of alerts/periods to return"
+        }
+
         # Weather alerts tool
         alerts_tool = Tool(
             name="get_alerts",
-            description="Get weather alerts for a US state",
+            description="Get weather alerts for one or more US states, marine areas or NWS zones",
             inputSchema={
                 "type": "object",
                 "properties": {
                     "state": {
                         "type": "string",
                         "description": "Two-letter US state code (e.g. CA, NY)"
-                    }
+                    },
+                    "states": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Several state or marine area codes to query at once (e.g. [\"TX\", \"LA\", \"MS\"])"
+                    },
+                    "zones": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "NWS forecast or county zone IDs (e.g. [\"TXZ211\", \"LAC071\"])"
+                    },
+                    "limit": limit_option,
+                    **output_options
                 },
-                "required": ["state"]
+                "anyOf": [
+                    {"required": ["state"]},
+                    {"required": ["states"]},
+                    {"required": ["zones"]}
+                ]
             }
         )
-        self.tools["get_alerts"] = alerts_tool
+        self.register_tool(alerts_tool)
         
         # Weather forecast tool
         forecast_tool = Tool(
@@ -204,22 +2750,194 @@ class MCPServer:
                     "longitude": {
                         "type": "number",
                         "description": "Longitude of the location"
-                    }
+                    },
+                    "limit": limit_option,
+                    **output_options
                 },
                 "required": ["latitude", "longitude"]
             }        )
-        self.tools["get_forecast"] = forecast_tool
+        self.register_tool(forecast_tool)
+        
+        # Batch forecast tool
+        forecast_batch_tool = Tool(
+            name="get_forecast_batch",
+            description="Get weather forecasts for many locations (e.g. points along a route) in one call",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "points": {
+                        "type": "array",
+                        "description": "Locations to forecast; results are returned in the same order",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "latitude": {"type": "number"},
+                                "longitude": {"type": "number"}
+                            },
+                            "required": ["latitude", "longitude"]
+                        },
+                        "minItems": 1,
+                        "maxItems": MCP_FORECAST_BATCH_MAX_POINTS
+                    },
+                    "periods": {
+                        "type": "integer",
+                        "description": "Forecast periods per location (default 5)",
+                        "minimum": 1,
+                        "maximum": FORECAST_MAX_PERIODS
+                    },
+                    "limit": {**limit_option, "description": "Same as periods"},
+                    **output_options
+                },
+                "required": ["points"]
+            }
+        )
+        self.register_tool(forecast_batch_tool)
+    
+    def initialize_resources(self):
+        """Initialize available resources"""
+        # Example resource
+        sample_resource = Resource(
+            uri="mcp://server/sample",
+            name="Sample Resource",
+            description="A sample resource for demonstration",
+            mimeType="text/plain"
+        )
+        self.register_resource("sample", sample_resource)
+    
+    def register_tool(self, tool: Tool):
+        """Add or replace a tool and invalidate the serialized tools list"""
+        self.tools[tool.name] = tool
+        self._tools_list_json = None
+        self.registry_version += 1
+        session_manager.broadcast({"jsonrpc": "2.0", "method": "notifications/tools/list_changed"})
+    
+    def register_resource(self, key: str, resource: Resource):
+        """Add or replace a resource and invalidate the serialized resources list"""
+        self.resources[key] = resource
+        self._resources_list_json = None
+        self.registry_version += 1
+        session_manager.broadcast({"jsonrpc": "2.0", "method": "notifications/resources/list_changed"})
+    
+    @property
+    def tools_list_json(self) -> bytes:
+        """tools/list result, serialized once per registry change"""
+        if self._tools_list_json is None:
+            self._tools_list_json = encode_json({"tools": [tool.model_dump() for tool in self.tools.values()]})
+        return self._tools_list_json
+    
+    @property
+    def resources_list_json(self) -> bytes:
+        """resources/list result, serialized once per registry change"""
+        if self._resources_list_json is None:
+            self._resources_list_json = encode_json({"resources": [resource.model_dump() for resource in self.resources.values()]})
+        return self._resources_list_json
+    
+    def initialize_methods(self):
+        """Initialize the JSON-RPC method table: method -> (handler, required permission)"""
+        self.methods: Dict[str, tuple[Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]], Optional[str]]] = {
+            "initialize": (self.handle_initialize, None),
+            "ping": (self.handle_ping, None),
+            "notifications/initialized": (self.handle_notification, None),
+            "notifications/cancelled": (self.handle_notification, None),
+            "tools/list": (self.handle_tools_list, "tools"),
+            "tools/call": (self.handle_tools_call, "tools"),
+            "resources/list": (self.handle_resources_list, "resources"),
+            "resources/read": (self.handle_resources_read, "resources"),
+            "resources/templates/list": (self.handle_resource_templates_list, "resources"),
+            "resources/subscribe": (self.handle_resources_subscribe, "resources"),
+            "resources/unsubscribe": (self.handle_resources_unsubscribe, "resources"),
+        }
+        # Methods whose handlers accept a progress callback for streamed responses
+        self.progress_methods = {"tools/call"}
+        # Methods whose handlers need the caller's streamable HTTP session
+        self.session_methods = {"resources/subscribe", "resources/unsubscribe"}
+    
+    async def dispatch(
+        self,
+        message: Any,
+        auth: AuthInfo,
+        progress: Optional[ProgressCallback] = None,
+        session: Optional[MCPSession] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Dispatch one JSON-RPC message; returns None for notifications"""
+        if not isinstance(message, dict) or message.get("jsonrpc") != "2.0" or not isinstance(message.get("method"), str):
+            request_id = message.get("id") if isinstance(message, dict) else None
+            return jsonrpc_error(request_id, JSONRPC_INVALID_REQUEST, "Invalid Request")
+        
+        is_notification = "id" not in message
+        request_id = message.get("id")
+        method = message["method"]
+        params = message.get("params")
+        if params is None:
+            params = {}
+        
+        entry = self.methods.get(method)
+        if entry is None:
+            if is_notification:
+                return None
+            return jsonrpc_error(request_id, JSONRPC_METHOD_NOT_FOUND, f"Method '{method}' not found")
+        handler, permission = entry
+        
+        if permission is not None and permission not in auth.permissions:
+            if is_notification:
+                return None
+            return jsonrpc_error(request_id, JSONRPC_PERMISSION_DENIED, f"Permission '{permission}' required")
+        if not isinstance(params, dict):
+            if is_notification:
+                return None
+            return jsonrpc_error(request_id, JSONRPC_INVALID_PARAMS, "params must be an object")
+        
+        method_labels = (("method", method),)
+        metrics.track("mcp_rpc_in_flight", method_labels, 1)
+        started = time.perf_counter()
+        try:
+            with tracer.span("rpc.dispatch", method=method):
+                if progress is not None and method in self.progress_methods:
+                    result = await handler(params, progress)
+                elif method in self.session_methods:
+                    result = await handler(params, session)
+                else:
+                    result = await handler(params)
+        except HTTPException as e:
+            code = JSONRPC_INVALID_PARAMS if e.status_code in (400, 404) else JSONRPC_INTERNAL_ERROR
+            response = jsonrpc_error(request_id, code, str(e.detail))
+        except UpstreamUnavailable as e:
+            response = jsonrpc_error(request_id, JSONRPC_UPSTREAM_UNAVAILABLE, str(e), {"retryAfter": math.ceil(e.retry_after)})
+        except Exception as e:
+            logger.error(f"JSON-RPC method '{method}' failed: {str(e)}")
+            response = jsonrpc_error(request_id, JSONRPC_INTERNAL_ERROR, "Internal error")
+        else:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        finally:
+            metrics.track("mcp_rpc_in_flight", method_labels, -1)
+        
+        elapsed = time.perf_counter() - started
+        outcome = "error" if "error" in response else "ok"
+        metrics.observe("mcp_rpc_duration_seconds", (("method", method), ("outcome", outcome)), elapsed)
+        metrics.observe("mcp_client_request_duration_seconds", (("client", auth.client_name), ("outcome", outcome)), elapsed)
+        return None if is_notification else response
     
-    def initialize_resources(self):
-        """Initialize available resources"""
-        # Example resource
-        sample_resource = Resource(
-            uri="mcp://server/sample",
-            name="Sample Resource",
-            description="A sample resource for demonstration",
-            mimeType="text/plain"
-        )
-        self.resources["sample"] = sample_resource
+    async def dispatch_batch(
+        self,
+        messages: list,
+        auth: AuthInfo,
+        session: Optional[MCPSession] = None
+    ) -> Optional[list | Dict[str, Any]]:
+        """Dispatch a JSON-RPC batch concurrently; responses keep request order"""
+        if not messages:
+            return jsonrpc_error(None, JSONRPC_INVALID_REQUEST, "Invalid Request: empty batch")
+        if len(messages) > MCP_BATCH_MAX_SIZE:
+            return jsonrpc_error(None, JSONRPC_INVALID_REQUEST, f"Invalid Request: batch exceeds {MCP_BATCH_MAX_SIZE} messages")
+        
+        semaphore = asyncio.Semaphore(MCP_BATCH_CONCURRENCY)
+        
+        async def run(message: Any) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.dispatch(message, auth, session=session)
+        
+        responses = await asyncio.gather(*(run(message) for message in messages))
+        responses = [response for response in responses if response is not None]
+        return responses or None
     
     async def handle_initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle MCP initialize request"""
@@ -240,56 +2958,275 @@ class MCPServer:
             }
         }
     
-    async def handle_tools_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
+    async def handle_ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle ping request"""
+        return {}
+    
+    async def handle_notification(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Acknowledge client notifications that need no server action"""
+        return {}
+    
+    async def handle_tools_list(self, params: Dict[str, Any]) -> RawJSON:
         """Handle tools/list request"""
-        tools_list = [tool.dict() for tool in self.tools.values()]
-        return {"tools": tools_list}
+        return RawJSON(self.tools_list_json)
     
-    async def handle_tools_call(self, params: Dict[str, Any]) -> Dict[str, Any]:
+    async def handle_tools_call(self, params: Dict[str, Any], progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
         """Handle tools/call request"""
         tool_name = params.get("name")
         arguments = params.get("arguments", {})
         
         if tool_name not in self.tools:
             raise HTTPException(status_code=400, detail=f"Tool '{tool_name}' not found")
+        if arguments is None:
+            arguments = {}
+        elif not isinstance(arguments, dict):
+            raise HTTPException(status_code=400, detail="arguments must be an object")
+        
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with tracer.span("tool.call", tool=tool_name):
+                # Streamed calls report their own progress, so they run on their own
+                if progress is not None:
+                    result = await self.execute_tool(tool_name, arguments, progress)
+                else:
+                    # Identical concurrent calls share one execution
+                    key = (tool_name, json.dumps(arguments, sort_keys=True, default=str))
+                    result = await self.tool_calls.do(key, lambda: self.execute_tool(tool_name, arguments))
+            outcome = "ok"
+            return result
+        finally:
+            metrics.observe("mcp_tool_duration_seconds", (("tool", tool_name), ("outcome", outcome)), time.perf_counter() - started)
+    
+    async def execute_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """Run a tool and build its MCP result, reporting partial output to progress if given"""
+        handler = self.tool_handlers.get(tool_name)
+        if handler is None:
+            return {"content": [{"type": "text", "text": "Tool executed successfully"}]}
+        return await handler(arguments, progress)
+    
+    async def tool_get_alerts(self, arguments: Dict[str, Any], progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """get_alerts: active alerts for one or more states/areas and zones, fetched concurrently"""
+        try:
+            areas, zones = parse_alert_targets(arguments)
+        except ValueError as e:
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"Error: {e}"
+                    }
+                ]
+            }
+        
+        if not areas and not zones:
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": "Error: State code is required"
+                    }
+                ]
+            }
+        if len(areas) + len(zones) > MCP_ALERTS_MAX_AREAS:
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"Error: At most {MCP_ALERTS_MAX_AREAS} states/zones per call"
+                    }
+                ]
+            }
+        try:
+            output_format, fields, limit, max_length = parse_output_options(arguments)
+        except ValueError as e:
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"Error: {e}"
+                    }
+                ]
+            }
+        
+        # Fan out one request per area/zone; the shared client caches, coalesces and bounds them
+        targets = areas + zones
+        urls = [f"{NWS_API_BASE}/alerts/active/area/{area}" for area in areas]
+        urls += [f"{NWS_API_BASE}/alerts/active/zone/{zone}" for zone in zones]
+        responses = await asyncio.gather(*(make_nws_request(url) for url in urls), return_exceptions=True)
+        
+        features = []
+        seen_ids = set()
+        failed = []
+        for target, data in zip(targets, responses):
+            if isinstance(data, BaseException) or not data or "features" not in data:
+                failed.append((target, data))
+                continue
+            for feature in data["features"]:
+                # The same alert is listed under every area it covers
+                alert_id = feature.get("id") or feature.get("properties", {}).get("id")
+                if alert_id is not None:
+                    if alert_id in seen_ids:
+                        continue
+                    seen_ids.add(alert_id)
+                features.append(feature)
+        
+        if len(failed) == len(targets):
+            # Nothing succeeded: surface an upstream error if there was one
+            errors = [data for _, data in failed if isinstance(data, BaseException)]
+            if errors:
+                raise next((e for e in errors if isinstance(e, UpstreamUnavailable)), errors[0])
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": "Unable to fetch alerts or no alerts found."
+                    }
+                ]
+            }
+        
+        failed_note = ""
+        if failed:
+            failed_note = f"\n\nUnable to fetch alerts for: {', '.join(target for target, _ in failed)}"
+        
+        if output_format == "json":
+            total = len(features)
+            alerts = [render_alert(feature, output_format, fields, max_length) for feature in features[:limit]]
+            if progress is not None:
+                await progress({"progress": len(alerts), "total": len(alerts)})
+            return structured_result({
+                "alerts": alerts,
+                "count": len(alerts),
+                "total": total,
+                "failed": [target for target, _ in failed]
+            })
+        
+        if not features:
+            if len(targets) == 1:
+                text = "No active alerts for this state."
+            else:
+                text = f"No active alerts for {', '.join(targets)}."
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": text + failed_note
+                    }
+                ]
+            }
+        
+        alerts = []
+        total = len(features)
+        shown = features[:limit]
+        with tracer.span("render.alerts", count=len(shown)):
+            for feature in shown:
+                alert = render_alert(feature, output_format, fields, max_length)
+                alerts.append(alert)
+                if progress is not None:
+                    await progress({"progress": len(alerts), "total": len(shown), "message": alert})
+        result_text = "\n---\n".join(alerts)
+        if len(shown) < total:
+            result_text += f"\n\nShowing {len(shown)} of {total} alerts."
+        result_text += failed_note
+        
+        return {
+            "content": [
+                {
+                    "type": "text",
+                    "text": result_text
+                }
+            ]
+        }
+    
+    async def tool_get_forecast(self, arguments: Dict[str, Any], progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """get_forecast: next forecast periods for a coordinate"""
+        latitude = arguments.get("latitude")
+        longitude = arguments.get("longitude")
+        
+        if latitude is None or longitude is None:
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": "Error: Both latitude and longitude are required"
+                    }
+                ]
+            }
+        
+        try:
+            coordinates = round_coordinates(latitude, longitude)
+        except (TypeError, ValueError):
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": "Error: latitude and longitude must be numbers"
+                    }
+                ]
+            }
+        
+        try:
+            output_format, fields, limit, max_length = parse_output_options(arguments)
+        except ValueError as e:
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"Error: {e}"
+                    }
+                ]
+            }
         
-        if tool_name == "get_alerts":
-            state = arguments.get("state", "")
-            if not state:
+        try:
+            # Resolve the forecast grid endpoint, from cache when possible
+            forecast_url = await resolve_forecast_url(coordinates)
+            if forecast_url is None:
                 return {
                     "content": [
                         {
                             "type": "text",
-                            "text": "Error: State code is required"
+                            "text": "Unable to fetch forecast data for this location."
                         }
                     ]
                 }
             
-            url = f"{NWS_API_BASE}/alerts/active/area/{state.upper()}"
-            data = await make_nws_request(url)
+            if progress is not None:
+                await progress({"progress": 0, "message": f"Resolved forecast grid: {forecast_url}"})
             
-            if not data or "features" not in data:
-                return {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": "Unable to fetch alerts or no alerts found."
-                        }
-                    ]
-                }
+            forecast_data = await make_nws_request(forecast_url)
             
-            if not data["features"]:
+            if not forecast_data:
                 return {
                     "content": [
                         {
                             "type": "text",
-                            "text": "No active alerts for this state."
+                            "text": "Unable to fetch detailed forecast."
                         }
                     ]
                 }
             
-            alerts = [format_alert(feature) for feature in data["features"]]
-            result_text = "\n---\n".join(alerts)
+            # Format the periods into a readable forecast
+            periods = forecast_data["properties"]["periods"][:limit or 5]  # Only show next 5 periods by default
+            if output_format == "json":
+                return structured_result({
+                    "latitude": coordinates[0],
+                    "longitude": coordinates[1],
+                    "periods": [render_forecast_period(period, output_format, fields, max_length) for period in periods]
+                })
+            forecasts = []
+            with tracer.span("render.forecast", count=len(periods)):
+                for period in periods:
+                    forecast = render_forecast_period(period, output_format, fields, max_length)
+                    forecasts.append(forecast)
+                    if progress is not None:
+                        await progress({"progress": len(forecasts), "total": len(periods), "message": forecast})
+            
+            result_text = "\n---\n".join(forecasts)
             
             return {
                 "content": [
@@ -300,88 +3237,151 @@ class MCPServer:
                 ]
             }
             
-        elif tool_name == "get_forecast":
-            latitude = arguments.get("latitude")
-            longitude = arguments.get("longitude")
-            
-            if latitude is None or longitude is None:
-                return {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": "Error: Both latitude and longitude are required"
-                        }
-                    ]
-                }
-            
-            # First get the forecast grid endpoint
-            points_url = f"{NWS_API_BASE}/points/{latitude},{longitude}"
-            points_data = await make_nws_request(points_url)
-            
-            if not points_data:
-                return {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": "Unable to fetch forecast data for this location."
-                        }
-                    ]
-                }
-            
-            # Get the forecast URL from the points response
-            try:
-                forecast_url = points_data["properties"]["forecast"]
-                forecast_data = await make_nws_request(forecast_url)
-                
-                if not forecast_data:
-                    return {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": "Unable to fetch detailed forecast."
-                            }
-                        ]
+        except KeyError as e:
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"Error parsing forecast data: {str(e)}"
                     }
-                
-                # Format the periods into a readable forecast
-                periods = forecast_data["properties"]["periods"]
-                forecasts = []
-                for period in periods[:5]:  # Only show next 5 periods
-                    forecast = f"""
-{period['name']}:
-Temperature: {period['temperature']}°{period['temperatureUnit']}
-Wind: {period['windSpeed']} {period['windDirection']}
-Forecast: {period['detailedForecast']}
-"""
-                    forecasts.append(forecast)
-                
-                result_text = "\n---\n".join(forecasts)
-                
-                return {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": result_text
-                        }
-                    ]
-                }
-                
-            except KeyError as e:
-                return {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": f"Error parsing forecast data: {str(e)}"
-                        }
-                    ]
-                }
+                ]
+            }
+    
+    async def tool_get_forecast_batch(self, arguments: Dict[str, Any], progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """get_forecast_batch: forecasts for many coordinates, one upstream fetch per unique gridpoint"""
+        points = arguments.get("points")
+        if not isinstance(points, list) or not points:
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": "Error: points must be a non-empty list of {latitude, longitude} objects"
+                    }
+                ]
+            }
+        if len(points) > MCP_FORECAST_BATCH_MAX_POINTS:
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"Error: At most {MCP_FORECAST_BATCH_MAX_POINTS} points per call"
+                    }
+                ]
+            }
+        try:
+            output_format, fields, limit, max_length = parse_output_options(arguments)
+            # limit means the same as periods here, as it does for get_forecast
+            period_count = arguments.get("periods")
+            if period_count is None:
+                period_count = min(limit, FORECAST_MAX_PERIODS) if limit is not None else 5
+            elif isinstance(period_count, bool) or not isinstance(period_count, int) or not 1 <= period_count <= FORECAST_MAX_PERIODS:
+                raise ValueError(f"periods must be an integer from 1 to {FORECAST_MAX_PERIODS}")
+            elif limit is not None and limit != period_count:
+                raise ValueError("Pass either periods or limit, not both")
+        except ValueError as e:
+            return {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"Error: {e}"
+                    }
+                ]
+            }
+        
+        # Per-point results: rounded coordinates, or an error message for unusable input
+        coordinates: list[Optional[tuple[float, float]]] = []
+        errors: Dict[int, str] = {}
+        for index, point in enumerate(points):
+            try:
+                coordinates.append(round_coordinates(point["latitude"], point["longitude"]))
+            except (KeyError, TypeError, ValueError):
+                coordinates.append(None)
+                errors[index] = "Error: latitude and longitude must be numbers"
+        
+        semaphore = asyncio.Semaphore(MCP_FORECAST_BATCH_CONCURRENCY)
+        
+        async def bounded(coro: Awaitable[Any]) -> Any:
+            async with semaphore:
+                return await coro
+        
+        # Resolve each distinct coordinate once, then fetch each distinct gridpoint forecast once
+        unique_coordinates = list(dict.fromkeys(c for c in coordinates if c is not None))
+        resolved = await asyncio.gather(
+            *(bounded(resolve_forecast_url(c)) for c in unique_coordinates),
+            return_exceptions=True
+        )
+        forecast_urls = dict(zip(unique_coordinates, resolved))
         
-        return {"content": [{"type": "text", "text": "Tool executed successfully"}]}
+        unique_urls = list(dict.fromkeys(u for u in resolved if isinstance(u, str)))
+        fetched = await asyncio.gather(
+            *(bounded(make_nws_request(u)) for u in unique_urls),
+            return_exceptions=True
+        )
+        forecasts = dict(zip(unique_urls, fetched))
+        
+        if unique_coordinates and not unique_urls:
+            # Nothing resolved: surface an upstream error rather than a page of failures
+            upstream_errors = [r for r in resolved if isinstance(r, UpstreamUnavailable)]
+            if upstream_errors:
+                raise upstream_errors[0]
+        
+        sections = []
+        records = []
+        for index, (point, coords) in enumerate(zip(points, coordinates)):
+            rendered = None
+            if index in errors:
+                body = errors[index]
+            else:
+                forecast_url = forecast_urls[coords]
+                forecast_data = forecasts.get(forecast_url) if isinstance(forecast_url, str) else None
+                if isinstance(forecast_url, KeyError):
+                    body = f"Error parsing forecast data: {str(forecast_url)}"
+                elif not isinstance(forecast_url, str):
+                    body = "Unable to fetch forecast data for this location."
+                elif not forecast_data or isinstance(forecast_data, BaseException):
+                    body = "Unable to fetch detailed forecast."
+                else:
+                    try:
+                        periods = forecast_data["properties"]["periods"][:period_count]
+                        rendered = [render_forecast_period(period, output_format, fields, max_length) for period in periods]
+                    except KeyError as e:
+                        body = f"Error parsing forecast data: {str(e)}"
+            if output_format == "json":
+                record: Dict[str, Any] = {"latitude": None, "longitude": None}
+                if coords is not None:
+                    record["latitude"], record["longitude"] = coords
+                if rendered is not None:
+                    record["periods"] = rendered
+                else:
+                    record["error"] = body
+                records.append(record)
+                if progress is not None:
+                    await progress({"progress": index + 1, "total": len(points)})
+                continue
+            if rendered is not None:
+                body = "\n---\n".join(rendered)
+            header = f"## Point {index + 1}"
+            if coords is not None:
+                header += f" ({coords[0]}, {coords[1]})"
+            section = f"{header}\n{body}"
+            sections.append(section)
+            if progress is not None:
+                await progress({"progress": index + 1, "total": len(points), "message": section})
+        
+        if output_format == "json":
+            return structured_result({"points": records})
+        return {
+            "content": [
+                {
+                    "type": "text",
+                    "text": "\n\n".join(sections)
+                }
+            ]
+        }
     
-    async def handle_resources_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
+    async def handle_resources_list(self, params: Dict[str, Any]) -> RawJSON:
         """Handle resources/list request"""
-        resources_list = [resource.dict() for resource in self.resources.values()]
-        return {"resources": resources_list}
+        return RawJSON(self.resources_list_json)
     
     async def handle_resources_read(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle resources/read request"""
@@ -398,7 +3398,50 @@ Forecast: {period['detailedForecast']}
                 ]
             }
         
+        area = alerts_resource_area(uri)
+        if area is not None:
+            result = await self.tool_get_alerts({"state": area})
+            return {
+                "contents": [
+                    {
+                        "uri": uri,
+                        "mimeType": "text/plain",
+                        "text": result["content"][0]["text"]
+                    }
+                ]
+            }
+        
         raise HTTPException(status_code=404, detail=f"Resource '{uri}' not found")
+    
+    async def handle_resource_templates_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle resources/templates/list request"""
+        return {
+            "resourceTemplates": [
+                {
+                    "uriTemplate": ALERTS_RESOURCE_PREFIX + "{state}",
+                    "name": "Active weather alerts",
+                    "description": "Active NWS alerts for a US state or marine area; subscribe to be notified when they change",
+                    "mimeType": "text/plain"
+                }
+            ]
+        }
+    
+    def require_subscribable(self, uri: Any, session: Optional[MCPSession]) -> str:
+        if uri != "mcp://server/sample" and alerts_resource_area(uri) is None:
+            raise HTTPException(status_code=404, detail=f"Resource '{uri}' not found")
+        if session is None:
+            raise HTTPException(status_code=400, detail="Subscriptions require an Mcp-Session-Id (send initialize first)")
+        return uri
+    
+    async def handle_resources_subscribe(self, params: Dict[str, Any], session: Optional[MCPSession] = None) -> Dict[str, Any]:
+        """Handle resources/subscribe request; updates are pushed on the session's GET /mcp/stream"""
+        session_manager.subscribe(session, self.require_subscribable(params.get("uri"), session))
+        return {}
+    
+    async def handle_resources_unsubscribe(self, params: Dict[str, Any], session: Optional[MCPSession] = None) -> Dict[str, Any]:
+        """Handle resources/unsubscribe request"""
+        session_manager.unsubscribe(session, self.require_subscribable(params.get("uri"), session))
+        return {}
 
 # Initialize MCP server
 mcp_server = MCPServer()
@@ -407,33 +3450,60 @@ mcp_server = MCPServer()
 async def lifespan(app: FastAPI):
     logger.info("🚀 Starting MCP FastAPI Server with Authentication")
       # Display API key configuration info
-    if VALID_API_KEYS:
-        env_keys = sum(1 for k in VALID_API_KEYS.values() if k.get("source") == "environment")
-        placeholder_keys = sum(1 for k in VALID_API_KEYS.values() if k.get("source") == "placeholder")
+    api_keys = key_store.keys
+    if api_keys:
+        env_keys = sum(1 for k in api_keys.values() if k.get("source") == "environment")
+        store_keys = sum(1 for k in api_keys.values() if k.get("source") in ("file", "sqlite"))
+        placeholder_keys = sum(1 for k in api_keys.values() if k.get("source") == "placeholder")
         
-        logger.info(f"📊 Loaded {len(VALID_API_KEYS)} API keys total:")
+        logger.info(f"📊 Loaded {len(api_keys)} API keys total:")
         if env_keys > 0:
             logger.info(f"   ✅ {env_keys} from environment variables (secure)")
+        if store_keys > 0:
+            logger.info(f"   ✅ {store_keys} from {key_store.source} (reloaded every {MCP_API_KEYS_POLL_INTERVAL:g}s)")
         if placeholder_keys > 0:
             logger.warning(f"   ⚠️  {placeholder_keys} placeholder keys (demo only - replace for production!)")
             logger.error("   ❌ Placeholder keys with <> brackets will not work for actual requests!")
             
         # List configured clients (without exposing keys)
-        for key_info in VALID_API_KEYS.values():
-            source_icon = "🔒" if key_info.get("source") == "environment" else "🔧"
+        for key_info in api_keys.values():
+            source_icon = "🔧" if key_info.get("source") == "placeholder" else "🔒"
             logger.info(f"   {source_icon} Client: {key_info['name']} | Permissions: {', '.join(key_info['permissions'])}")
     else:
         logger.error("❌ No API keys configured - server will reject all requests!")
     
+    key_watcher = asyncio.create_task(key_store.watch()) if key_store.reloadable else None
+    await nws_client.start()
+    refresher = asyncio.create_task(cache_refresher.run()) if CACHE_REFRESH_ENABLED else None
+    snapshot_loader = asyncio.create_task(cache_snapshot.load()) if cache_snapshot.enabled else None
+    snapshotter = asyncio.create_task(cache_snapshot.run()) if cache_snapshot.enabled and CACHE_SNAPSHOT_INTERVAL > 0 else None
+    session_expirer = asyncio.create_task(session_manager.run())
     yield
     logger.info("🛑 Shutting down MCP FastAPI Server")
+    session_expirer.cancel()
+    if key_watcher is not None:
+        key_watcher.cancel()
+    if refresher is not None:
+        refresher.cancel()
+    if snapshotter is not None:
+        snapshotter.cancel()
+    if cache_snapshot.enabled:
+        if snapshot_loader is not None and not snapshot_loader.done():
+            snapshot_loader.cancel()
+        saved = await cache_snapshot.save()
+        logger.info(f"💾 Saved {saved} cache entries to {cache_snapshot.path}")
+    await session_manager.shutdown()
+    tracer.flush()
+    await nws_client.close()
+    await shared_cache.close()
 
 # Create FastAPI app
 app = FastAPI(
     title="MCP FastAPI Server with Authentication",
     description="Model Context Protocol server implementation using FastAPI with weather tools and API key authentication",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Add CORS middleware
@@ -443,16 +3513,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Mcp-Session-Id"],
 )
 
+# Root span per HTTP request, so dependency resolution (auth) is traced too
+if tracer.enabled:
+    app.add_middleware(TracingMiddleware)
+
 @app.get("/")
 async def root():
     """Health check endpoint with configuration info"""
     # Count API key sources
-    env_keys = sum(1 for k in VALID_API_KEYS.values() if k.get("source") == "environment")
-    placeholder_keys = sum(1 for k in VALID_API_KEYS.values() if k.get("source") == "placeholder")
+    api_keys = key_store.keys
+    env_keys = sum(1 for k in api_keys.values() if k.get("source") == "environment")
+    store_keys = sum(1 for k in api_keys.values() if k.get("source") in ("file", "sqlite"))
+    placeholder_keys = sum(1 for k in api_keys.values() if k.get("source") == "placeholder")
     
-    config_status = "production-ready" if env_keys > 0 and placeholder_keys == 0 else "development"
+    config_status = "production-ready" if env_keys + store_keys > 0 and placeholder_keys == 0 else "development"
     if placeholder_keys > 0:
         config_status = "demo-placeholder-keys"
     
@@ -461,12 +3538,13 @@ async def root():
         "status": "healthy",
         "version": "1.0.0",
         "api_keys": {
-            "total": len(VALID_API_KEYS),
+            "total": len(api_keys),
             "environment_vars": env_keys,
+            "key_store": store_keys,
             "placeholder_demo": placeholder_keys,
             "configuration_status": config_status
         },
-        "security_note": "Replace placeholder API keys for production use" if placeholder_keys > 0 else "Using secure environment variables"
+        "security_note": "Replace placeholder API keys for production use" if placeholder_keys > 0 else f"Using secure API keys from {key_store.kind}"
     }
 
 @app.get("/auth/info")
@@ -474,19 +3552,94 @@ async def auth_info(auth: AuthInfo = Depends(authenticate_request)):
     """Get information about the authenticated client"""
     return {
         "client_name": auth.client_name,
-        "permissions": auth.permissions,
+        "permissions": sorted(auth.permissions),
         "authenticated": True
     }
 
 @app.get("/tools")
 async def list_tools(auth: AuthInfo = Depends(require_permission("tools"))):
     """REST endpoint to list available tools (requires authentication)"""
-    return {"tools": [tool.dict() for tool in mcp_server.tools.values()]}
+    return Response(content=mcp_server.tools_list_json, media_type="application/json")
 
 @app.get("/resources")
 async def list_resources(auth: AuthInfo = Depends(require_permission("resources"))):
     """REST endpoint to list available resources (requires authentication)"""
-    return {"resources": [resource.dict() for resource in mcp_server.resources.values()]}
+    return Response(content=mcp_server.resources_list_json, media_type="application/json")
+
+@app.get("/stats")
+async def stats(auth: AuthInfo = Depends(authenticate_request)):
+    """Runtime statistics for capacity tuning (authenticated)"""
+    return {
+        "json_backend": JSON_BACKEND,
+        "api_keys": key_store.stats(),
+        "rate_limits": rate_limiter.stats(),
+        "upstream": nws_client.stats(),
+        "points_cache": points_cache.stats(),
+        "response_cache": nws_client.cache.stats(),
+        "shared_cache": shared_cache.stats(),
+        "snapshot": cache_snapshot.stats(),
+        "render_cache": render_cache.stats(),
+        "refresher": cache_refresher.stats(),
+        "sessions": session_manager.stats(),
+        "tracing": tracer.stats(),
+        "profiler": request_profiler.stats(),
+        "coalescing": {
+            "upstream": nws_client.inflight.stats(),
+            "tools": mcp_server.tool_calls.stats()
+        }
+    }
+
+def metrics_snapshot() -> list[tuple[str, str, str, list[tuple[tuple, float]]]]:
+    """Cache ratios and in-flight gauges read from the live components at scrape time."""
+    caches = {
+        "response": nws_client.cache.stats(),
+        "points": points_cache.stats(),
+        "render": render_cache.stats()
+    }
+    lookups = []
+    for cache, stats in caches.items():
+        lookups.append(((("cache", cache), ("result", "hit")), stats["hits"] + stats.get("stale_hits", 0)))
+        lookups.append(((("cache", cache), ("result", "miss")), stats["misses"]))
+    if shared_cache.enabled:
+        caches["shared"] = shared_cache.stats()
+        lookups.append(((("cache", "shared"), ("result", "hit")), shared_cache.hits))
+        lookups.append(((("cache", "shared"), ("result", "miss")), shared_cache.misses))
+    upstream = nws_client.stats()
+    bulkhead = upstream["bulkhead"]
+    return [
+        ("mcp_cache_lookups_total", "counter", "Cache lookups by cache and result", lookups),
+        ("mcp_cache_hit_ratio", "gauge", "Share of cache lookups served from memory",
+            [((("cache", cache),), stats["hit_ratio"]) for cache, stats in caches.items() if stats["hit_ratio"] is not None]),
+        ("nws_upstream_in_flight", "gauge", "NWS requests currently outstanding", [((), upstream["in_flight"])]),
+        ("nws_bulkhead_active", "gauge", "Upstream bulkhead slots in use", [((), bulkhead["active"])]),
+        ("nws_bulkhead_waiting", "gauge", "Callers queued for an upstream bulkhead slot", [((), bulkhead["waiting"])]),
+        ("nws_circuit_breaker_open", "gauge", "1 while an endpoint's circuit breaker is not closed",
+            [((("endpoint", name),), 0 if breaker["state"] == "closed" else 1) for name, breaker in upstream["circuit_breakers"].items()]),
+        ("mcp_rate_limit_in_flight", "gauge", "Requests holding a per-client in-flight slot", [((), rate_limiter.stats()["in_flight"])]),
+        ("mcp_tool_calls_in_flight", "gauge", "Distinct tool executions currently running", [((), mcp_server.tool_calls.stats()["in_flight"])]),
+        ("mcp_sessions", "gauge", "Open streamable HTTP sessions", [((), len(session_manager.sessions))])
+    ]
+
+@app.get("/metrics")
+async def prometheus_metrics(auth: AuthInfo = Depends(authenticate_request)):
+    """Prometheus metrics: latency histograms, counters and gauges (authenticated)"""
+    return Response(content=metrics.render(metrics_snapshot()), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.post("/admin/profile")
+async def start_profile(requests: int = 10, auth: AuthInfo = Depends(require_permission("admin"))):
+    """Profile the next N MCP requests with cProfile and dump the results (admin only)"""
+    if not 1 <= requests <= 1000:
+        raise HTTPException(status_code=400, detail="requests must be between 1 and 1000")
+    if request_profiler.remaining > 0:
+        raise HTTPException(status_code=409, detail="A profiling run is already in progress")
+    request_profiler.arm(requests)
+    logger.info(f"🔬 {auth.client_name} armed CPU profiling for the next {requests} requests")
+    return request_profiler.stats()
+
+@app.get("/admin/profile")
+async def profile_status(auth: AuthInfo = Depends(require_permission("admin"))):
+    """Status of the current profiling run and location of the last dump (admin only)"""
+    return request_profiler.stats()
 
 @app.get("/test")
 async def serve_test_page():
@@ -542,21 +3695,184 @@ async def call_tool(
         raise HTTPException(status_code=404, detail=f"Tool '{tool_name}' not found")
     
     # Call the MCP server tool handler
+    async with rate_limiter.limit(auth_info), request_profiler.sample():
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await mcp_server.handle_tools_call(params)
+            outcome = "ok"
+            # Returning a Response directly skips FastAPI's jsonable_encoder pass
+            return FastJSONResponse(result)
+                
+        except UpstreamUnavailable as e:
+            raise HTTPException(
+                status_code=503,
+                detail=str(e),
+                headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Tool execution failed: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Tool execution failed: {str(e)}")
+        finally:
+            metrics.observe(
+                "mcp_client_request_duration_seconds",
+                (("client", auth_info.client_name), ("outcome", outcome)),
+                time.perf_counter() - started
+            )
+
+def sse_event(message: Dict[str, Any]) -> str:
+    """Frame a JSON-RPC message as a Server-Sent Event."""
+    return f"event: message\ndata: {encode_jsonrpc(message).decode('utf-8')}\n\n"
+
+async def stream_tool_call(message: Dict[str, Any], auth: AuthInfo, on_close: Optional[Callable[[], None]] = None):
+    """Run a tools/call and yield progress notifications, then the final response, as SSE.
+
+    Progress notifications (carrying each formatted alert / forecast period as
+    their message) are only sent when the client supplied
+    params._meta.progressToken, as the MCP spec requires. on_close runs when
+    the stream ends or the client disconnects.
+    """
+    params = message.get("params")
+    meta = params.get("_meta") if isinstance(params, dict) else None
+    progress_token = meta.get("progressToken") if isinstance(meta, dict) else None
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    async def emit(update: Dict[str, Any]):
+        await queue.put({
+            "jsonrpc": "2.0",
+            "method": "notifications/progress",
+            "params": {"progressToken": progress_token, **update}
+        })
+    
+    async def run():
+        try:
+            response = await mcp_server.dispatch(message, auth, emit if progress_token is not None else None)
+        except Exception as e:
+            logger.error(f"Streamed tool call failed: {str(e)}")
+            response = jsonrpc_error(message.get("id"), JSONRPC_INTERNAL_ERROR, "Internal error")
+        await queue.put(response)
+    
+    task = asyncio.create_task(run())
     try:
-        result = await mcp_server.handle_tools_call(params)
-        return result
-            
-    except Exception as e:
-        logger.error(f"Tool execution failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Tool execution failed: {str(e)}")
+        # Flush headers and a first byte immediately, before any upstream work finishes
+        yield ": stream opened\n\n"
+        while True:
+            item = await queue.get()
+            yield sse_event(item)
+            if "method" not in item:
+                break
+    finally:
+        task.cancel()
+        if on_close is not None:
+            on_close()
+
+@app.post("/mcp/stream")
+async def mcp_stream(request: Request):
+    """MCP streamable HTTP endpoint: JSON-RPC 2.0 over POST (authenticated)"""
+    # Authenticate once; per-method permissions are checked by the dispatcher
+    auth = authenticate_api_key(parse_authorization(request.headers.get("authorization")))
+    
+    try:
+        message = decode_json(await request.body())
+    except JSON_DECODE_ERRORS:
+        return Response(content=encode_jsonrpc(jsonrpc_error(None, JSONRPC_PARSE_ERROR, "Parse error")), media_type="application/json")
+    
+    # initialize hands out a session id; the session itself is only looked up (and
+    # allocated) for methods that need it, so other calls work on any worker
+    messages = message if isinstance(message, list) else [message]
+    session_id = request.headers.get("mcp-session-id")
+    session = None
+    if isinstance(message, dict) and message.get("method") == "initialize":
+        session_id = session_manager.issue(auth)
+    elif session_id and any(isinstance(m, dict) and m.get("method") in mcp_server.session_methods for m in messages):
+        session = session_manager.open(session_id, auth)
+    session_headers = {"Mcp-Session-Id": session_id} if session_id else {}
+    
+    # Quotas apply to tool calls; rejections happen before any upstream work
+    cost = sum(1 for m in messages if isinstance(m, dict) and m.get("method") == "tools/call")
+    if cost:
+        await rate_limiter.acquire(auth, cost)
+    
+    # Stream long tool calls as Server-Sent Events when the client accepts them
+    if (
+        isinstance(message, dict)
+        and message.get("method") == "tools/call"
+        and "id" in message
+        and "text/event-stream" in request.headers.get("accept", "")
+    ):
+        return StreamingResponse(
+            stream_tool_call(message, auth, on_close=lambda: rate_limiter.release(auth)),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **session_headers}
+        )
+    
+    try:
+        async with request_profiler.sample():
+            if isinstance(message, list):
+                response = await mcp_server.dispatch_batch(message, auth, session=session)
+            else:
+                response = await mcp_server.dispatch(message, auth, session=session)
+    finally:
+        if cost:
+            rate_limiter.release(auth)
+    if response is None:
+        # Notifications are accepted without a response body
+        return Response(status_code=202, headers=session_headers)
+    return Response(content=encode_jsonrpc(response), media_type="application/json", headers=session_headers)
+
+async def stream_session(session: MCPSession):
+    """Yield a session's server-initiated notifications as SSE, with periodic keep-alive comments."""
+    session.streams += 1
+    try:
+        yield ": stream opened\n\n"
+        while not session.closed:
+            try:
+                message = await asyncio.wait_for(session.queue.get(), MCP_STREAM_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if message is SESSION_CLOSED:
+                break
+            yield sse_event(message)
+    finally:
+        session.streams -= 1
+        session.last_seen = time.monotonic()
+
+def require_session(request: Request) -> tuple[AuthInfo, str]:
+    auth = authenticate_api_key(parse_authorization(request.headers.get("authorization")))
+    session_id = request.headers.get("mcp-session-id")
+    if not session_id:
+        raise HTTPException(status_code=400, detail="Mcp-Session-Id header required")
+    return auth, session_id
+
+@app.get("/mcp/stream")
+async def mcp_stream_listen(request: Request):
+    """MCP streamable HTTP endpoint: server-to-client notifications for a session (authenticated)"""
+    auth, session_id = require_session(request)
+    session = session_manager.open(session_id, auth)
+    return StreamingResponse(
+        stream_session(session),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Mcp-Session-Id": session.id}
+    )
+
+@app.delete("/mcp/stream")
+async def mcp_stream_close(request: Request):
+    """Terminate a streamable HTTP session and drop its subscriptions (authenticated)"""
+    auth, session_id = require_session(request)
+    session_manager.get(session_id, auth)  # 404 unless the id belongs to the caller
+    session_manager.close(session_id)
+    return Response(status_code=204)
 
 @app.options("/mcp/stream")
 async def mcp_stream_options():
     """Handle CORS preflight for MCP stream endpoint"""
     return {
         "status": "ok",
-        "methods": ["POST", "OPTIONS"],
-        "headers": ["Content-Type", "Accept", "Authorization"]
+        "methods": ["GET", "POST", "DELETE", "OPTIONS"],
+        "headers": ["Content-Type", "Accept", "Authorization", "Mcp-Session-Id"]
     }
 
 if __name__ == "__main__":
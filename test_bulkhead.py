@@ -0,0 +1,86 @@
+"""Upstream bulkhead: bounded concurrency, bounded queue and load shedding."""
+
+import asyncio
+
+import httpx
+import pytest
+
+import main
+
+pytestmark = pytest.mark.anyio
+
+
+async def hold(bulkhead: main.Bulkhead, release: asyncio.Event):
+    async with bulkhead.slot():
+        await release.wait()
+
+
+async def test_queue_full_is_shed_immediately():
+    bulkhead = main.Bulkhead(max_concurrent=1, max_queue=1, queue_timeout=5.0)
+    release = asyncio.Event()
+    holder = asyncio.create_task(hold(bulkhead, release))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(hold(bulkhead, release))
+    await asyncio.sleep(0)
+    assert bulkhead.active == 1 and bulkhead.waiting == 1
+
+    with pytest.raises(main.UpstreamOverloaded):
+        async with bulkhead.slot():
+            pass
+    assert bulkhead.rejected_queue_full == 1
+
+    release.set()
+    await asyncio.gather(holder, waiter)
+    assert bulkhead.admitted == 2 and bulkhead.active == 0
+
+
+async def test_expected_wait_over_budget_is_shed():
+    bulkhead = main.Bulkhead(max_concurrent=1, max_queue=10, queue_timeout=0.5)
+    bulkhead.service_time = 2.0  # Recent calls held a slot for 2s
+    release = asyncio.Event()
+    holder = asyncio.create_task(hold(bulkhead, release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(main.UpstreamOverloaded) as excinfo:
+        async with bulkhead.slot():
+            pass
+    assert bulkhead.shed == 1
+    assert excinfo.value.retry_after > 0.5
+
+    release.set()
+    await holder
+
+
+async def test_queue_wait_times_out():
+    bulkhead = main.Bulkhead(max_concurrent=1, max_queue=10, queue_timeout=0.05)
+    release = asyncio.Event()
+    holder = asyncio.create_task(hold(bulkhead, release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(main.UpstreamOverloaded):
+        async with bulkhead.slot():
+            pass
+    assert bulkhead.timeouts == 1 and bulkhead.waiting == 0
+
+    release.set()
+    await holder
+
+
+async def test_shed_calls_are_served_from_cache(nws_client, upstream):
+    url = "https://api.weather.gov/alerts/active/area/TX"
+    upstream.handler = lambda request: httpx.Response(200, json={"features": [1]}, headers={"Cache-Control": "max-age=0, stale-while-revalidate=0"})
+    cached = await nws_client.get_json(url)
+
+    nws_client.bulkhead = main.Bulkhead(max_concurrent=1, max_queue=0, queue_timeout=1.0)
+    release = asyncio.Event()
+    holder = asyncio.create_task(hold(nws_client.bulkhead, release))
+    await asyncio.sleep(0)
+
+    # Expired and shed: the stale copy beats failing outright
+    assert await nws_client.get_json(url) is cached
+    with pytest.raises(main.UpstreamOverloaded):
+        await nws_client.get_json("https://api.weather.gov/alerts/active/area/CA")
+    assert len(upstream.requests) == 1
+
+    release.set()
+    await holder
@@ -0,0 +1,97 @@
+"""Per-endpoint circuit breakers and bounded retries in front of the NWS API."""
+
+import httpx
+import pytest
+
+import main
+
+pytestmark = pytest.mark.anyio
+
+ALERTS_URL = "https://api.weather.gov/alerts/active/area/TX"
+
+
+def test_opens_after_threshold_then_half_opens_and_closes():
+    breaker = main.CircuitBreaker("alerts", failure_threshold=3, recovery_time=30)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.opened == 1
+    assert not breaker.allow()
+
+    breaker.opened_at -= 30  # Recovery time has passed
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()  # Only one probe at a time
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.consecutive_failures == 0
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens():
+    breaker = main.CircuitBreaker("alerts", failure_threshold=1, recovery_time=30)
+    breaker.record_failure()
+    breaker.opened_at -= 30
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.opened == 2
+    assert not breaker.allow()
+    assert breaker.retry_after() > 1
+
+
+def test_released_probe_can_be_retried():
+    breaker = main.CircuitBreaker("alerts", failure_threshold=1, recovery_time=30)
+    breaker.record_failure()
+    breaker.opened_at -= 30
+    assert breaker.allow()
+    breaker.release_probe()  # e.g. shed by the bulkhead before reaching upstream
+    assert breaker.allow()
+
+
+async def test_upstream_failures_open_the_endpoint_breaker(nws_client, upstream):
+    upstream.handler = lambda request: httpx.Response(503)
+    for _ in range(main.NWS_BREAKER_FAILURE_THRESHOLD):
+        assert await nws_client.get_json(ALERTS_URL) is None
+    # Each failed call was retried NWS_RETRY_ATTEMPTS times
+    assert len(upstream.requests) == main.NWS_BREAKER_FAILURE_THRESHOLD * (main.NWS_RETRY_ATTEMPTS + 1)
+    assert nws_client.breakers["alerts"].state == "open"
+
+    sent = len(upstream.requests)
+    with pytest.raises(main.CircuitOpen):
+        await nws_client.get_json(ALERTS_URL)
+    assert len(upstream.requests) == sent
+    # Other endpoint families have their own breaker, so /points still goes upstream (and is retried)
+    await nws_client.get_json("https://api.weather.gov/points/30,-97")
+    assert len(upstream.requests) == sent + 3
+
+
+async def test_half_open_probe_success_closes(nws_client, upstream):
+    upstream.handler = lambda request: httpx.Response(503)
+    for _ in range(main.NWS_BREAKER_FAILURE_THRESHOLD):
+        await nws_client.get_json(ALERTS_URL)
+    breaker = nws_client.breakers["alerts"]
+    breaker.opened_at -= main.NWS_BREAKER_RECOVERY_TIME
+
+    upstream.handler = lambda request: httpx.Response(200, json={"features": []})
+    assert await nws_client.get_json(ALERTS_URL) == {"features": []}
+    assert breaker.state == "closed"
+
+
+async def test_client_errors_do_not_trip_the_breaker(nws_client, upstream):
+    upstream.handler = lambda request: httpx.Response(404)
+    for _ in range(main.NWS_BREAKER_FAILURE_THRESHOLD + 1):
+        assert await nws_client.get_json(ALERTS_URL) is None
+    assert nws_client.breakers["alerts"].state == "closed"
+    assert len(upstream.requests) == main.NWS_BREAKER_FAILURE_THRESHOLD + 1
+
+
+async def test_cached_copy_is_served_while_open(nws_client, upstream):
+    upstream.handler = lambda request: httpx.Response(200, json={"features": [1]}, headers={"Cache-Control": "max-age=0, stale-while-revalidate=0"})
+    cached = await nws_client.get_json(ALERTS_URL)
+    upstream.handler = lambda request: httpx.Response(503)
+    for _ in range(main.NWS_BREAKER_FAILURE_THRESHOLD):
+        await nws_client.get_json(ALERTS_URL)
+    assert nws_client.breakers["alerts"].state == "open"
+    assert await nws_client.get_json(ALERTS_URL) is cached
@@ -0,0 +1,85 @@
+"""get_forecast_batch: option validation, gridpoint sharing and per-point result order."""
+
+import httpx
+import pytest
+
+from conftest import FULL_KEY
+
+BASE = "https://api.weather.gov"
+
+# Two coordinates in the same gridpoint, one in another
+GRIDPOINTS = {
+    "/points/30.1,-97.1": "/gridpoints/EWX/1,1/forecast",
+    "/points/30.2,-97.2": "/gridpoints/EWX/1,1/forecast",
+    "/points/40.0,-75.0": "/gridpoints/PHI/2,2/forecast",
+}
+
+
+def serve_gridpoints(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if path in GRIDPOINTS:
+        return httpx.Response(200, json={"properties": {"forecast": BASE + GRIDPOINTS[path]}}, headers={"Cache-Control": "max-age=60"})
+    if path.endswith("/forecast"):
+        office = path.split("/")[2]
+        periods = [{"number": n, "name": f"{office} period {n}", "temperature": n, "temperatureUnit": "F"} for n in range(1, 15)]
+        return httpx.Response(200, json={"properties": {"periods": periods}}, headers={"Cache-Control": "max-age=60"})
+    return httpx.Response(404)
+
+
+def call(client, **arguments) -> dict:
+    response = client.post(
+        "/mcp/stream",
+        json={"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": "get_forecast_batch", "arguments": arguments}},
+        headers={"Authorization": f"Bearer {FULL_KEY}"}
+    )
+    assert response.status_code == 200
+    return response.json()["result"]
+
+
+def point(latitude: float, longitude: float) -> dict:
+    return {"latitude": latitude, "longitude": longitude}
+
+
+def test_points_sharing_a_gridpoint_share_one_forecast_fetch(app_client, upstream):
+    upstream.handler = serve_gridpoints
+    points = [point(30.1, -97.1), point(40.0, -75.0), point(30.2, -97.2), point(30.1, -97.1)]
+    call(app_client, points=points, format="json")
+    paths = [request.url.path for request in upstream.requests]
+    assert sorted(p for p in paths if p.startswith("/points/")) == sorted(GRIDPOINTS)
+    assert sorted(p for p in paths if p.endswith("/forecast")) == ["/gridpoints/EWX/1,1/forecast", "/gridpoints/PHI/2,2/forecast"]
+
+
+def test_results_follow_input_order(app_client, upstream):
+    upstream.handler = serve_gridpoints
+    points = [point(40.0, -75.0), {"latitude": "north"}, point(30.1, -97.1), point(10.0, 10.0)]
+    records = call(app_client, points=points, periods=2, format="json")["structuredContent"]["points"]
+    assert [(r["latitude"], r["longitude"]) for r in records] == [(40.0, -75.0), (None, None), (30.1, -97.1), (10.0, 10.0)]
+    assert [p["name"] for p in records[0]["periods"]] == ["PHI period 1", "PHI period 2"]
+    assert "latitude and longitude must be numbers" in records[1]["error"]
+    assert [p["name"] for p in records[2]["periods"]] == ["EWX period 1", "EWX period 2"]
+    assert "Unable to fetch" in records[3]["error"]
+
+    text = call(app_client, points=points[:3])["content"][0]["text"]
+    assert text.index("## Point 1 (40.0, -75.0)") < text.index("## Point 2") < text.index("## Point 3 (30.1, -97.1)")
+
+
+def test_limit_is_an_alias_for_periods(app_client, upstream):
+    upstream.handler = serve_gridpoints
+    records = call(app_client, points=[point(30.1, -97.1)], limit=3, format="json")["structuredContent"]["points"]
+    assert len(records[0]["periods"]) == 3
+    records = call(app_client, points=[point(30.1, -97.1)], limit=3, periods=3, format="json")["structuredContent"]["points"]
+    assert len(records[0]["periods"]) == 3
+
+
+@pytest.mark.parametrize("arguments, message", [
+    ({"periods": "abc"}, "periods must be an integer from 1 to 14"),
+    ({"periods": 0}, "periods must be an integer from 1 to 14"),
+    ({"periods": 99}, "periods must be an integer from 1 to 14"),
+    ({"periods": True}, "periods must be an integer from 1 to 14"),
+    ({"limit": 0}, "limit must be a positive integer"),
+    ({"periods": 2, "limit": 3}, "Pass either periods or limit, not both"),
+])
+def test_invalid_options_are_rejected_before_upstream(app_client, upstream, arguments, message):
+    text = call(app_client, points=[point(30.1, -97.1)], **arguments)["content"][0]["text"]
+    assert text.startswith("Error:") and message in text
+    assert upstream.requests == []
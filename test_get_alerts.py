@@ -0,0 +1,68 @@
+"""get_alerts fan-out across states and zones: validation, de-duplication and partial failure."""
+
+import httpx
+import pytest
+
+from conftest import FULL_KEY
+
+
+def alert(alert_id: str, event: str = "Flood Warning") -> dict:
+    return {"id": alert_id, "properties": {"id": alert_id, "event": event, "areaDesc": "Somewhere", "severity": "Severe"}}
+
+
+FEEDS = {
+    "/alerts/active/area/TX": [alert("shared"), alert("tx-only")],
+    "/alerts/active/area/LA": [alert("shared"), alert("la-only")],
+    "/alerts/active/zone/TXZ211": [alert("zone-only")],
+}
+
+
+def serve_feeds(request: httpx.Request) -> httpx.Response:
+    features = FEEDS.get(request.url.path)
+    if features is None:
+        return httpx.Response(404)
+    return httpx.Response(200, json={"features": features}, headers={"Cache-Control": "max-age=60"})
+
+
+def call(client, **arguments) -> dict:
+    response = client.post(
+        "/mcp/stream",
+        json={"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": "get_alerts", "arguments": arguments}},
+        headers={"Authorization": f"Bearer {FULL_KEY}"}
+    )
+    assert response.status_code == 200
+    return response.json()["result"]
+
+
+def test_fans_out_and_dedups_alerts_by_id(app_client, upstream):
+    upstream.handler = serve_feeds
+    result = call(app_client, states=["tx", "LA", "TX"], zones=["txz211"], format="json")["structuredContent"]
+    assert sorted(request.url.path for request in upstream.requests) == sorted(FEEDS)
+    assert sorted(item["id"] for item in result["alerts"]) == ["la-only", "shared", "tx-only", "zone-only"]
+    assert result["failed"] == []
+
+
+def test_partial_failure_is_noted_without_failing_the_call(app_client, upstream):
+    upstream.handler = serve_feeds
+    result = call(app_client, states=["TX", "OK"], format="json")["structuredContent"]
+    assert [item["id"] for item in result["alerts"]] == ["shared", "tx-only"]
+    assert result["failed"] == ["OK"]
+    text = call(app_client, states=["TX", "OK"])["content"][0]["text"]
+    assert "Unable to fetch alerts for: OK" in text
+
+
+@pytest.mark.parametrize("arguments, message", [
+    ({"states": "TX"}, "states must be a list of strings"),
+    ({"zones": "TXZ211"}, "zones must be a list of strings"),
+    ({"states": 5}, "states must be a list of strings"),
+    ({"states": ["TX", 5]}, "states must be a list of strings"),
+    ({"state": 5}, "state must be a string"),
+    ({"state": "TX/../../points/1,1"}, "Unknown state or area code"),
+    ({"state": "ZZ"}, "Unknown state or area code"),
+    ({"zones": ["TXZ21/../1"]}, "Invalid zone"),
+    ({}, "State code is required"),
+])
+def test_invalid_targets_are_rejected_before_upstream(app_client, upstream, arguments, message):
+    text = call(app_client, **arguments)["content"][0]["text"]
+    assert text.startswith("Error:") and message in text
+    assert upstream.requests == []
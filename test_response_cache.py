@@ -0,0 +1,107 @@
+"""HTTP-aware response cache: freshness from Cache-Control and conditional revalidation."""
+
+import asyncio
+
+import httpx
+import pytest
+
+import main
+
+pytestmark = pytest.mark.anyio
+
+URL = "https://api.weather.gov/alerts/active/area/TX"
+
+
+def test_parse_cache_headers():
+    assert main.parse_cache_headers(httpx.Headers({"Cache-Control": "max-age=60, stale-while-revalidate=5"})) == (60.0, 5.0)
+    assert main.parse_cache_headers(httpx.Headers({"Cache-Control": "max-age=60", "Age": "50"}))[0] == 10.0
+    assert main.parse_cache_headers(httpx.Headers({"Cache-Control": "no-store"})) is None
+    assert main.parse_cache_headers(httpx.Headers({"Cache-Control": "no-cache"})) == (0.0, 0.0)
+    assert main.parse_cache_headers(httpx.Headers({"Cache-Control": "no-cache, stale-while-revalidate=5"})) == (0.0, 5.0)
+    assert main.parse_cache_headers(httpx.Headers({"Cache-Control": "max-age=60"}))[1] == main.RESPONSE_CACHE_STALE_WHILE_REVALIDATE
+
+
+async def test_fresh_entries_skip_upstream(nws_client, upstream):
+    first = await nws_client.get_json(URL)
+    assert await nws_client.get_json(URL) is first
+    assert len(upstream.requests) == 1
+    assert nws_client.cache.hits == 1
+
+
+async def test_expired_entry_is_revalidated_with_304(nws_client, upstream):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"Cache-Control": "max-age=60"})
+        return httpx.Response(200, json={"features": [1]}, headers={
+            "Cache-Control": "max-age=0, stale-while-revalidate=0",
+            "ETag": '"v1"',
+            "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"
+        })
+
+    upstream.handler = handler
+    first = await nws_client.get_json(URL)
+    again = await nws_client.get_json(URL)
+
+    assert again is first
+    assert len(upstream.requests) == 2
+    conditional = upstream.requests[1].headers
+    assert conditional["if-none-match"] == '"v1"'
+    assert conditional["if-modified-since"] == "Wed, 01 Jan 2025 00:00:00 GMT"
+    assert nws_client.cache.not_modified == 1
+    # The 304 carried max-age=60, so the entry is fresh again
+    assert await nws_client.get_json(URL) is first
+    assert len(upstream.requests) == 2
+
+
+async def test_stale_entry_is_served_while_revalidating(nws_client, upstream):
+    upstream.handler = lambda request: httpx.Response(200, json={"features": [1]}, headers={"Cache-Control": "max-age=0, stale-while-revalidate=60"})
+    first = await nws_client.get_json(URL)
+    upstream.handler = lambda request: httpx.Response(200, json={"features": [2]}, headers={"Cache-Control": "max-age=60"})
+
+    assert await nws_client.get_json(URL) is first
+    assert nws_client.cache.stale_hits == 1
+    task = nws_client._revalidation_tasks[URL]
+    await task
+    assert await nws_client.get_json(URL) == {"features": [2]}
+
+
+async def test_concurrent_misses_share_one_request(nws_client, upstream):
+    results = await asyncio.gather(*(nws_client.get_json(URL) for _ in range(10)))
+    assert all(result is results[0] for result in results)
+    assert len(upstream.requests) == 1
+    assert nws_client.inflight.coalesced == 9
+
+
+async def test_failure_fallback_respects_max_stale(nws_client, upstream):
+    upstream.handler = lambda request: httpx.Response(200, json={"features": [1]}, headers={"Cache-Control": "max-age=0, stale-while-revalidate=0"})
+    cached = await nws_client.get_json(URL)
+    upstream.handler = lambda request: httpx.Response(503)
+    nws_client.max_stale = 60
+    assert await nws_client.get_json(URL) is cached
+
+    nws_client.cache.get_entry(URL).expires_at -= 61
+    assert await nws_client.get_json(URL) is None
+    for _ in range(main.NWS_BREAKER_FAILURE_THRESHOLD):
+        nws_client.breakers["alerts"].record_failure()
+    with pytest.raises(main.CircuitOpen):
+        await nws_client.get_json(URL)
+
+
+async def test_snapshot_drops_entries_past_max_stale(nws_client, tmp_path):
+    nws_client.max_stale = 60
+    nws_client.cache.set(URL, {"features": [1]}, ttl=-30, stale_ttl=0, etag='"v1"')
+    nws_client.cache.set(URL + "?old", {"features": [2]}, ttl=-90, stale_ttl=0, etag='"v2"')
+    snapshot = main.CacheSnapshot(nws_client, main.TTLCache(maxsize=10, ttl=60), str(tmp_path / "snapshot.json"), 0, 10)
+    document = snapshot.collect()
+    assert [item["url"] for item in document["responses"]] == [URL]
+
+    # An entry that aged past the limit while the server was down is not restored either
+    document["responses"][0]["expires"] -= 60
+    document["responses"].append({**document["responses"][0], "url": URL + "?recent", "expires": document["created"]})
+    snapshot._write(document)
+    restored = main.NWSClient()
+    restored.max_stale = 60
+    snapshot.client = restored
+    await snapshot.load()
+    assert URL not in restored.cache and URL + "?recent" in restored.cache
+    assert snapshot.restored_responses == 1
@@ -0,0 +1,173 @@
+"""Streamable HTTP sessions: lazy allocation, per-key caps, eviction, expiry and subscriptions."""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import main
+from conftest import FULL_KEY, OTHER_KEY, auth_for
+
+pytestmark = pytest.mark.anyio
+
+
+def make_manager(**overrides) -> main.SessionManager:
+    settings = dict(poll_interval=60, ttl=60, max_sessions=3, max_per_key=2, max_subscriptions=2, max_subscriptions_per_key=3)
+    settings.update(overrides)
+    return main.SessionManager(**settings)
+
+
+def rpc(client, method: str, params: dict | None = None, session_id: str | None = None, key: str = FULL_KEY):
+    headers = {"Authorization": f"Bearer {key}"}
+    if session_id:
+        headers["Mcp-Session-Id"] = session_id
+    return client.post("/mcp/stream", json={"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}, headers=headers)
+
+
+def test_issued_ids_allocate_nothing_until_opened():
+    manager = make_manager()
+    auth = auth_for(FULL_KEY)
+    session_ids = [manager.issue(auth) for _ in range(10)]
+    assert manager.sessions == {}
+    assert manager.get(session_ids[0], auth) is None
+    session = manager.open(session_ids[0], auth)
+    assert manager.get(session_ids[0], auth) is session
+
+
+def test_ids_are_bound_to_their_key():
+    manager = make_manager()
+    session_id = manager.issue(auth_for(FULL_KEY))
+    for bad_id, auth in ((session_id, auth_for(OTHER_KEY)), ("forged.0000", auth_for(FULL_KEY))):
+        with pytest.raises(HTTPException) as excinfo:
+            manager.get(bad_id, auth)
+        assert excinfo.value.status_code == 404
+
+
+def test_per_key_cap_evicts_least_recently_seen_idle_session():
+    manager = make_manager()
+    auth = auth_for(FULL_KEY)
+    first, second, third = (manager.issue(auth) for _ in range(3))
+    manager.open(first, auth)
+    manager.open(second, auth)
+    manager.sessions[first].last_seen -= 10
+    manager.open(third, auth)
+    assert set(manager.sessions) == {second, third}
+    assert manager.evicted == 1
+    with pytest.raises(HTTPException) as excinfo:
+        manager.get(first, auth)  # Evicted ids are not silently revived
+    assert excinfo.value.status_code == 404
+
+
+def test_per_key_cap_with_only_streaming_sessions_is_429():
+    manager = make_manager()
+    auth = auth_for(FULL_KEY)
+    for _ in range(2):
+        manager.open(manager.issue(auth), auth).streams = 1
+    with pytest.raises(HTTPException) as excinfo:
+        manager.open(manager.issue(auth), auth)
+    assert excinfo.value.status_code == 429
+
+
+def test_global_cap_evicts_instead_of_refusing():
+    manager = make_manager(max_sessions=2)
+    full, other = auth_for(FULL_KEY), auth_for(OTHER_KEY)
+    oldest = manager.open(manager.issue(full), full)
+    oldest.last_seen -= 10
+    manager.open(manager.issue(other), other)
+    manager.open(manager.issue(other), other)
+    assert oldest.id not in manager.sessions
+    assert len(manager.sessions) == 2
+
+
+def test_idle_sessions_expire():
+    manager = make_manager(ttl=60)
+    auth = auth_for(FULL_KEY)
+    idle = manager.open(manager.issue(auth), auth)
+    streaming = manager.open(manager.issue(auth), auth)
+    streaming.streams = 1
+    idle.last_seen -= 61
+    streaming.last_seen -= 61
+    manager.expire()
+    assert list(manager.sessions) == [streaming.id]
+    assert manager.expired == 1
+    with pytest.raises(HTTPException):
+        manager.get(idle.id, auth)
+
+
+async def test_subscriptions_are_validated_and_capped():
+    manager = make_manager()
+    auth = auth_for(FULL_KEY)
+    session = manager.open(manager.issue(auth), auth)
+    assert main.alerts_resource_area("mcp://alerts/ZZ9") is None
+    assert main.alerts_resource_area("mcp://alerts/ca") == "CA"
+    assert main.alerts_resource_area("mcp://alerts/PZ") == "PZ"
+
+    manager.subscribe(session, "mcp://alerts/ca")
+    manager.subscribe(session, "mcp://alerts/CA")  # Same feed, not a second subscription
+    manager.subscribe(session, "mcp://alerts/TX")
+    with pytest.raises(HTTPException):
+        manager.subscribe(session, "mcp://alerts/NY")
+    assert len(manager._pollers) == 2
+
+    # The per-key cap spans all of the key's sessions
+    other = manager.open(manager.issue(auth), auth)
+    manager.subscribe(other, "mcp://alerts/FL")
+    with pytest.raises(HTTPException):
+        manager.subscribe(other, "mcp://alerts/GA")
+
+    manager.close(session.id)
+    assert set(manager._pollers) == {"mcp://alerts/FL"}
+    await manager.shutdown()
+
+
+async def test_close_ends_open_stream():
+    manager = make_manager()
+    auth = auth_for(FULL_KEY)
+    session = manager.open(manager.issue(auth), auth)
+    stream = main.stream_session(session)
+    assert await stream.__anext__() == ": stream opened\n\n"
+    session.push({"jsonrpc": "2.0", "method": "notifications/resources/updated", "params": {"uri": "mcp://alerts/TX"}})
+    assert "notifications/resources/updated" in await stream.__anext__()
+    manager.close(session.id)
+    with pytest.raises(StopAsyncIteration):
+        await asyncio.wait_for(stream.__anext__(), 1)
+    assert session.streams == 0
+
+
+def test_initialize_never_fills_the_session_table(app_client):
+    session_ids = {rpc(app_client, "initialize").headers["mcp-session-id"] for _ in range(25)}
+    assert len(session_ids) == 25
+    assert main.session_manager.sessions == {}
+    assert rpc(app_client, "ping", session_id=session_ids.pop()).status_code == 200
+
+
+def test_subscribe_opens_the_session_and_delete_closes_it(app_client):
+    session_id = rpc(app_client, "initialize").headers["mcp-session-id"]
+    response = rpc(app_client, "resources/subscribe", {"uri": "mcp://alerts/TX"}, session_id)
+    assert response.json()["result"] == {}
+    assert session_id in main.session_manager.sessions
+    assert "error" in rpc(app_client, "resources/subscribe", {"uri": "mcp://alerts/ZZ9"}, session_id).json()
+
+    headers = {"Authorization": f"Bearer {FULL_KEY}", "Mcp-Session-Id": session_id}
+    assert app_client.delete("/mcp/stream", headers=headers).status_code == 204
+    assert session_id not in main.session_manager.sessions
+    subscribe = {"uri": "mcp://alerts/TX"}
+    assert rpc(app_client, "resources/subscribe", subscribe, session_id).status_code == 404
+    assert rpc(app_client, "resources/subscribe", subscribe, session_id, key=OTHER_KEY).status_code == 404
+
+
+def test_other_methods_ignore_the_session_header(app_client):
+    """A session id issued by another worker (different secret) must not break plain calls."""
+    foreign = make_manager(secret="another-worker").issue(auth_for(FULL_KEY))
+    for method in ("tools/list", "ping"):
+        response = rpc(app_client, method, session_id=foreign)
+        assert response.status_code == 200 and "result" in response.json()
+    assert rpc(app_client, "resources/subscribe", {"uri": "mcp://alerts/TX"}, foreign).status_code == 404
+
+
+def test_shared_secret_lets_any_worker_verify_ids():
+    auth = auth_for(FULL_KEY)
+    session_id = make_manager(secret="shared").issue(auth)
+    assert make_manager(secret="shared").get(session_id, auth) is None
+    with pytest.raises(HTTPException):
+        make_manager().get(session_id, auth)